@@ -0,0 +1,76 @@
+"""
+Memory footprint of quantities: bytes per Units/SingleUnits object for the current slotted layout
+compared with the legacy layout which kept a __dict__ with a duplicate value and a private units dict.
+SingleUnits are interned per signature, so their layout is measured on fresh instances,
+and creating an already interned one again, which allocates nothing, is reported separately.
+
+Run with `python -m benchmarks.memory_benchmark`
+"""
+import tracemalloc
+
+from units import Units, SingleUnits
+from units.constants.time import sec
+
+COUNT = 100_000
+
+
+class LegacyUnits(float):
+    """Replica of the previous Units layout, used as the "before" baseline"""
+
+    def __new__(cls, value: float, units: dict):
+        return float.__new__(cls, value)
+
+    def __init__(self, value: float, units: dict):
+        self.value = value
+        self.units = units
+
+
+class LegacySingleUnits(LegacyUnits):
+
+    def __new__(cls, units: dict):
+        return super().__new__(cls, 1, units)
+
+    def __init__(self, units: dict):
+        self.units = units
+        super().__init__(1, units)
+
+
+def fresh_single_units(units) -> SingleUnits:
+    """
+    New SingleUnits instance bypassing the interning, to measure the size of the layout itself
+    """
+    obj = float.__new__(SingleUnits, 1)
+    obj.units = units
+    return obj
+
+
+def bytes_per_quantity(factory, count: int = COUNT) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    list_overhead = objects.__sizeof__()
+    return max(0.0, (after - before - list_overhead) / count)
+
+
+def run() -> dict:
+    return {
+        "Units": {
+            "before": bytes_per_quantity(lambda i: LegacyUnits(i + 0.5, {"sec": 1})),
+            "after": bytes_per_quantity(lambda i: Units(i + 0.5, sec.units)),
+        },
+        "SingleUnits": {
+            "before": bytes_per_quantity(lambda i: LegacySingleUnits({"sec": 1})),
+            "after": bytes_per_quantity(lambda i: fresh_single_units(sec.units)),
+        },
+        "SingleUnits reused": {
+            "before": bytes_per_quantity(lambda i: LegacySingleUnits({"sec": 1})),
+            "after": bytes_per_quantity(lambda i: SingleUnits(sec.units)),
+        },
+    }
+
+
+if __name__ == "__main__":
+    for name, res in run().items():
+        print(f"{name:18} before: {res['before']:7.1f} B   after: {res['after']:7.1f} B")
@@ -0,0 +1,46 @@
+"""
+Scaling of units.parallel.parallel_convert with the number of worker processes
+compared with a single-process Converter.inplace over the same buffer.
+
+Run with `python -m benchmarks.parallel_benchmark [size]`
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from units.constants.length import m, km
+from units.constants.time import sec, hr
+from units.parallel import parallel_convert
+
+SIZE = 20_000_000
+
+
+def best_of(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(size: int = SIZE) -> dict:
+    values = np.random.random(size) >> m / sec
+    converter = (m / sec).to(km / hr)
+    results = {"single_process": best_of(lambda: converter.inplace(values.value.copy()))}
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(workers) as executor:
+            parallel_convert(values, km / hr, executor=executor, threshold=0)  # start the workers
+            results[f"workers.{workers}"] = best_of(
+                lambda: parallel_convert(values, km / hr, executor=executor, workers=workers, threshold=0))
+        workers *= 2
+    return results
+
+
+if __name__ == "__main__":
+    for name, seconds in run(int(sys.argv[1]) if len(sys.argv) > 1 else SIZE).items():
+        print(f"{name:16} {seconds * 1000:10.1f} ms")
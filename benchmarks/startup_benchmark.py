@@ -0,0 +1,79 @@
+"""
+Startup cost of the registry: importing the predefined units and registering many custom groups
+one create_units call at a time, as one lazy batch, or by restoring a snapshot.
+
+Run with `python -m benchmarks.startup_benchmark`
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from units import UnitRegistry, use_registry
+
+GROUPS = 1000
+UNITS_PER_GROUP = 5
+
+
+def groups() -> dict:
+    return {f"Group{g}": {f"unit{g}_{i}": 10 for i in range(UNITS_PER_GROUP)} for g in range(GROUPS)}
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def import_seconds() -> float:
+    code = "import time; t = time.perf_counter(); import units.constants.time, units.constants.length; " \
+           "print(time.perf_counter() - t)"
+    return float(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def first_use(registry: UnitRegistry):
+    with use_registry(registry):
+        registry.load_units("unit0_0")
+
+
+def run() -> dict:
+    definitions = groups()
+
+    def eager():
+        registry = UnitRegistry()
+        for group_name, unit_to_weight_map in definitions.items():
+            registry.create_units(group_name=group_name, **unit_to_weight_map)
+        first_use(registry)
+
+    def lazy():
+        registry = UnitRegistry()
+        for group_name, unit_to_weight_map in definitions.items():
+            registry.create_units(group_name=group_name, lazy=True, **unit_to_weight_map)
+        first_use(registry)
+
+    source = UnitRegistry()
+    source.create_groups(definitions)
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        source.save_snapshot(path)
+
+        def snapshot():
+            registry = UnitRegistry()
+            registry.load_snapshot(path)
+            first_use(registry)
+
+        return {
+            "import_predefined": import_seconds(),
+            f"{GROUPS}_groups.eager": timed(eager),
+            f"{GROUPS}_groups.lazy": timed(lazy),
+            f"{GROUPS}_groups.snapshot": timed(snapshot),
+        }
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    for name, seconds in run().items():
+        print(f"{name:25} {seconds * 1000:10.2f} ms")
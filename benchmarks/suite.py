@@ -0,0 +1,177 @@
+"""
+Speed benchmarks of the hot paths: scalar arithmetic, alignment of mixed units, `>>` conversion,
+hashing, registry operations and how they scale with the number of registered units
+and with the size of a single group.
+
+Run with `python -m benchmarks.suite [--quick] [--output results.json] [--compare baseline.json]`
+Every case reports operations per second and the peak memory allocated by a single operation,
+the bytes per quantity of memory_benchmark and the timings of startup_benchmark are included as well.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict
+
+from benchmarks import memory_benchmark, startup_benchmark
+from units import UnitRegistry, use_registry, create_units, load_units, destroy_units
+from units.constants import PREDEFINED_GROUP_LIST
+from units.constants.length import m, km
+from units.constants.time import sec, hr, min as minute
+
+REGISTRY_SIZES = (10, 100, 1000, 10000)
+
+
+def measure(func: Callable, number: int, repeat: int = 3) -> dict:
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    tracemalloc.start()
+    func()  # warm up caches so only the steady state is measured
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": number / best, "peak_alloc_bytes": peak - before}
+
+
+def scalar_cases() -> Dict[str, Callable]:
+    a, b = 2 * m / sec, 3 * km / hr
+    nested = [[1, 2, 3], [4, 5, 6]]
+    converted = nested >> m / sec ** 2
+    keys = [i * minute for i in range(100)]
+    d = {k: i for i, k in enumerate(keys)}
+    return {
+        "arithmetic.mul": lambda: m * m,
+        "arithmetic.div": lambda: 2 * m / sec,
+        "arithmetic.add_same_units": lambda: a + a,
+        "alignment.add_mixed_units": lambda: a + b,
+        "alignment.compare_mixed_units": lambda: a < b,
+        "alignment.eq_mixed_units": lambda: 1 * hr == 60 * minute,
+        "conversion.scalar": lambda: a >> km / hr,
+        "conversion.nested_list_create": lambda: nested >> m / sec ** 2,
+        "conversion.nested_list_convert": lambda: converted >> km / hr ** 2,
+        "hashing.hash": lambda: hash(a),
+        "hashing.dict_lookup": lambda: d[60 * sec],
+        "hashing.set_build": lambda: set(keys),
+    }
+
+
+def registry_cases() -> Dict[str, Callable]:
+    def create_destroy():
+        create_units(group_name="BenchGroup", bench_small=1, bench_big=10)
+        destroy_units("BenchGroup")
+
+    return {
+        "registry.create_destroy_units": create_destroy,
+        "registry.load_units_by_name": lambda: load_units("m", "sec"),
+        "registry.load_units_by_group": lambda: load_units(group_name=PREDEFINED_GROUP_LIST[0]),
+    }
+
+
+def scaling_cases(size: int) -> Dict[str, Callable]:
+    registry = UnitRegistry()
+    registry.create_groups({
+        PREDEFINED_GROUP_LIST[0]: {"mm": 1, "cm": 10, "m": 100, "km": 1000},
+        PREDEFINED_GROUP_LIST[1]: {"ms": 1, "sec": 1000, "min": 60, "hr": 60, "day": 24, "week": 7},
+        **{f"Scale{g}": {f"scale{g}_{i}": 1 + i for i in range(10)} for g in range(size // 10)},
+    })
+    a = 2 * m / sec
+
+    def activated(func):
+        def run():
+            with use_registry(registry):
+                return func()
+        return run
+
+    def create_destroy():
+        registry.create_units(group_name="BenchGroup", bench_small=1, bench_big=10)
+        registry.destroy_units("BenchGroup")
+
+    return {
+        f"scaling.{size}.mul": activated(lambda: m * m),
+        f"scaling.{size}.add_mixed_units": activated(lambda: a + km / hr),
+        f"scaling.{size}.conversion": activated(lambda: a >> km / hr),
+        f"scaling.{size}.hash": activated(lambda: hash(a)),
+        f"scaling.{size}.create_destroy_units": create_destroy,
+        f"scaling.{size}.destroy_missing_group": lambda: registry.destroy_units("MissingGroup"),
+        f"scaling.{size}.load_units_by_name": lambda: registry.load_units("m", "sec"),
+        f"scaling.{size}.load_units_by_group": lambda: registry.load_units(group_name="Scale0"),
+        f"scaling.{size}.load_all_units": registry.load_units,
+    }
+
+
+def large_group_cases(size: int) -> Dict[str, Callable]:
+    """
+    A single group holding all the units, extended one unit at a time
+    """
+    registry = UnitRegistry()
+    registry.create_units(group_name="Large", weight_type="abs", **{f"large_{i}": 1 + i for i in range(size)})
+    first, last = registry.load_units("large_0", f"large_{size - 1}")
+    with use_registry(registry):
+        value = 2 * first
+
+    def convert():
+        with use_registry(registry):
+            return value >> last
+
+    return {
+        f"large_group.{size}.add_unit": lambda: registry.create_units(group_name="Large", large_extra=size + 1),
+        f"large_group.{size}.conversion": convert,
+        f"large_group.{size}.load_units_by_group": lambda: registry.load_units(group_name="Large"),
+    }
+
+
+def _is_slow(name: str) -> bool:
+    # registry updates and operations over all units run fewer iterations
+    return any(part in name for part in ("create_destroy", "destroy_missing", "load_all", "add_unit", "by_group"))
+
+
+def run(quick: bool = False) -> dict:
+    number = 200 if quick else 5000
+    results = {}
+    for name, func in {**scalar_cases(), **registry_cases()}.items():
+        results[name] = measure(func, number)
+    for size in REGISTRY_SIZES:
+        for name, func in scaling_cases(size).items():
+            results[name] = measure(func, number // 10 if _is_slow(name) else number)
+        for name, func in large_group_cases(size).items():
+            results[name] = measure(func, number // 10 if _is_slow(name) else number)
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+        "memory": memory_benchmark.run(),
+        "startup_seconds": startup_benchmark.run(),
+    }
+
+
+def compare(results: dict, baseline: dict):
+    for name, res in results["results"].items():
+        old = baseline["results"].get(name)
+        ratio = f"{res['ops_per_sec'] / old['ops_per_sec']:6.2f}x" if old else "    new"
+        print(f"{name:45} {res['ops_per_sec']:14,.0f} ops/s {ratio}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke testing")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    else:
+        for name, res in results["results"].items():
+            print(f"{name:45} {res['ops_per_sec']:14,.0f} ops/s {res['peak_alloc_bytes']:8} B")
+
+
+if __name__ == "__main__":
+    main()
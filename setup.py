@@ -16,5 +16,6 @@ setup(
     author_email='lubomyr.ivanitskiy@gmail.com',
     description='Python library for working with custom and predefined number measurement units',
     long_description=readme(),
-    long_description_content_type="text/markdown"
+    long_description_content_type="text/markdown",
+    extras_require={"numpy": ["numpy"], "pandas": ["numpy", "pandas"]}
 )
@@ -0,0 +1,38 @@
+import units as u
+from units import create_units, destroy_units, conversion_cache_info, clear_conversion_cache
+
+
+def test_cache_statistics():
+    small, big = create_units(group_name="CacheUnits", small=1, big=10)
+    clear_conversion_cache()
+    assert str(3 * big >> small) == "30 small"
+    misses = conversion_cache_info()["conversion"].misses
+    assert str(4 * big >> small) == "40 small"
+    info = conversion_cache_info()["conversion"]
+    assert info.misses == misses
+    assert info.hits >= 1
+    assert small + big == 11 * small
+    assert conversion_cache_info()["alignment"].currsize >= 1
+    dispatch = conversion_cache_info()["dispatch"]
+    assert str(small + big) == "11 small"
+    assert conversion_cache_info()["dispatch"].hits == dispatch.hits + 1
+    destroy_units("CacheUnits")
+
+
+def test_cache_invalidation_on_registry_change():
+    small, big = create_units(group_name="CacheUnits", small=1, big=10)
+    assert str(2 * big >> small) == "20 small"
+    destroy_units("CacheUnits")
+    small, big = create_units(group_name="CacheUnits", small=1, big=100)
+    assert str(2 * big >> small) == "200 small"
+    assert str(small + big) == "101 small"
+    destroy_units("CacheUnits")
+
+
+def test_cache_is_bounded():
+    cache = u._BoundedCache(2)
+    for i in range(5):
+        cache.put(i, i)
+    assert cache.info().currsize == 2
+    assert cache.get(4) == 4
+    assert cache.get(0) is None
@@ -0,0 +1,48 @@
+from array import array
+
+import pytest
+
+from units.constants.time import *
+from units.constants.length import *
+
+
+def test_converter_scalars():
+    to_kmh = (m / sec).to(km / hr)
+    assert to_kmh(2) == pytest.approx(7.2)
+    assert str(to_kmh(2 * m / sec)) == "7.2 km/hr"
+    with pytest.raises(AssertionError):
+        to_kmh(2 * m)
+    with pytest.raises(AssertionError):
+        (m / sec).to(sec)
+
+
+def test_converter_sequences():
+    to_min = hr.to(min)
+    assert to_min([1, 2.5]) == [60, 150]
+    values = [1, 2]
+    assert to_min.inplace(values) is values
+    assert values == [60, 120]
+
+
+def test_converter_array_module():
+    to_min = hr.to(min)
+    a = array("d", [1, 2])
+    b = to_min(a)
+    assert list(a) == [1, 2] and list(b) == [60, 120]
+    assert to_min.inplace(a) is a
+    assert list(a) == [60, 120]
+    c = to_min(array("i", [1, 2]))
+    assert c.typecode == "d" and list(c) == [60, 120]
+
+
+def test_converter_numpy():
+    np = pytest.importorskip("numpy")
+    to_min = hr.to(min)
+    a = np.array([1.0, 2.0])
+    assert to_min(a).tolist() == [60, 120]
+    assert to_min.inplace(a) is a
+    assert a.tolist() == [60, 120]
+    assert str(to_min(np.array([1, 2]) >> hr)) == "[ 60., 120.] min"
+    assert to_min(np.array([1, 2])).tolist() == [60, 120]
+    with pytest.raises(AssertionError, match="Only float arrays"):
+        to_min.inplace(np.array([1, 2]))
@@ -0,0 +1,98 @@
+import pytest
+
+from units import create_units, destroy_units
+from units.decorators import unit_function, memoize
+from units.constants.time import *
+from units.constants.length import *
+
+
+@unit_function(inputs=(m, sec), returns=m / sec)
+def speed(distance, time):
+    return distance / time
+
+
+def test_arguments_are_converted_once_to_floats():
+    @unit_function(inputs=(m, sec))
+    def types(distance, time):
+        return type(distance), type(time)
+
+    assert types(2 * km, 1 * min) == (float, float)
+    assert str(speed(2 * km, 1 * min)) == str(33.333333333333336 * m / sec)
+    assert str(speed(10 * m, 2 * sec)) == "5 m/sec"
+    assert str(speed(distance=10 * m, time=2000 * ms)) == "5 m/sec"
+
+
+def test_wrong_units_are_rejected():
+    with pytest.raises(AssertionError):
+        speed(2 * sec, 1 * min)
+    with pytest.raises(AssertionError):
+        speed(2, 1 * min)
+
+
+def test_skipped_inputs_and_tuple_returns():
+    @unit_function(inputs={"time": sec}, returns=(sec, sec))
+    def split(time, parts):
+        return time / parts, time % parts
+
+    half, rest = split(1 * min, 7)
+    assert str(rest) == "4 sec"
+    assert half == 60 / 7 * sec
+
+
+def test_arrays():
+    np = pytest.importorskip("numpy")
+    res = speed(np.array([1, 2]) >> km, 1 * min)
+    assert res.units == {"m": 1, "sec": -1}
+    assert np.allclose(res.value, [1000 / 60, 2000 / 60])
+
+
+def test_memoize_by_quantity():
+    calls = []
+
+    @memoize(maxsize=2)
+    def cost(duration, rate=1):
+        calls.append(duration)
+        return duration * rate
+
+    assert str(cost(60 * min)) == "60 min"
+    assert str(cost(1 * hr)) == "60 min"
+    assert str(cost(1 * hr, rate=2)) == "2 hr"
+    cost(2 * hr)
+    cost(60 * min)  # evicted as the least recently used one
+    assert len(calls) == 4
+    info = cost.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+    assert info.hit_rate == 0.2
+    cost.cache_clear()
+    assert cost.cache_info().currsize == 0
+
+
+def test_memoize_ttl_and_registry_changes():
+    small, big = create_units(group_name="MemoUnits", small=1, big=10)
+    calls = []
+
+    @memoize(ttl=60)
+    def double(value):
+        calls.append(value)
+        return 2 * value
+
+    double(1 * big)
+    double(10 * small)
+    double(1 * sec)
+    assert len(calls) == 1 + 1
+    destroy_units("MemoUnits")
+    small, big = create_units(group_name="MemoUnits", small=1, big=100)
+    double(10 * small)  # same key, stale weights
+    double(1 * sec)
+    assert len(calls) == 3
+    assert double.cache_info().invalidated == 1
+    destroy_units("MemoUnits")
+
+    @memoize(ttl=0)
+    def expiring(value):
+        calls.append(value)
+        return value
+
+    expiring(1 * sec)
+    expiring(1 * sec)
+    assert len(calls) == 5
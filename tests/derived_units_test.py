@@ -0,0 +1,63 @@
+import pytest
+
+from units import UnitRegistry, use_registry
+from units.constants.length import mm, m, km
+from units.constants.time import sec, hr
+
+
+@pytest.fixture
+def registry():
+    registry = UnitRegistry()
+    registry.create_groups({"Length": {"mm": 1, "cm": 10, "m": 100, "km": 1000},
+                            "Time": {"ms": 1, "sec": 1000, "min": 60, "hr": 60},
+                            "Mass": {"g": 1, "kg": 1000}})
+    with use_registry(registry):
+        yield registry
+
+
+def test_derived_units_convert_through_base_units(registry):
+    g, kg = registry.load_units("g", "kg")
+    N, = registry.define_units(N=kg * m / sec ** 2)
+    kph, mps = registry.define_units(group_name="Speed", kph=km / hr, mps=m / sec)
+    assert str(2 * N >> kg * m / sec ** 2) == "2 (m*kg)/sec^2"
+    assert str(3 * kg * m / sec ** 2 >> N) == "3 N"
+    assert (36 * kph >> mps).value == pytest.approx(10)
+    assert (1 * kph >> m / sec).value == pytest.approx(1 / 3.6)
+    assert 1 * N == 1000 * g * m / sec ** 2
+    assert hash(1 * N) == hash(1 * kg * m / sec ** 2)
+    with pytest.raises(AssertionError):
+        1 * N >> m / sec
+    assert not 3 * kph > 1 * m / sec
+    assert 3 * kph < 1 * m / sec
+    assert 4 * kph > 1 * kph
+    assert 1 * mps >= 3.6 * kph - 1 * kph
+    assert ((1 * mps + 3.6 * kph) >> m / sec).value == pytest.approx(2)
+    with pytest.raises(AssertionError):
+        registry.define_units(group_name="Speed", accel=m / sec ** 2)
+
+
+def test_conversion_tables(registry):
+    table = registry.conversion_table("Length")
+    assert table.units == ("mm", "cm", "m", "km")
+    assert table.factor("km", "m") == 1000
+    assert list(table.factors_to("m")) == [0.001, 0.01, 1, 1000]
+    registry.create_units(group_name="Length", weight_type="abs", um=0.001, m=1000)
+    extended = registry.conversion_table("Length")
+    assert extended.units == ("mm", "cm", "m", "km", "um")
+    assert extended.factor("km", "um") == 1e9
+    assert list(extended.factors_to("m")) == [0.001, 0.01, 1, 1000, 0.000001]
+    assert list(table.factors_to("m")) == [0.001, 0.01, 1, 1000]
+    assert str(1 * m >> registry.load_units("mm")) == "1000 mm"
+    registry.destroy_units("Mass")
+    with pytest.raises(KeyError):
+        registry.conversion_table("Mass")
+
+
+def test_definitions_survive_snapshots(registry, tmp_path):
+    kg = registry.load_units("kg")
+    N, = registry.define_units(N=kg * m / sec ** 2)
+    registry.save_snapshot(str(tmp_path / "registry.json"))
+    restored = UnitRegistry()
+    restored.load_snapshot(str(tmp_path / "registry.json"))
+    with use_registry(restored):
+        assert str(5 * N >> kg * mm / sec ** 2) == "5000 (mm*kg)/sec^2"
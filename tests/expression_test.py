@@ -0,0 +1,49 @@
+import pytest
+
+from units.expression import lazy, Expression
+from units.constants.time import *
+from units.constants.length import *
+
+
+@pytest.mark.parametrize("build", [
+    lambda l: l(2 * m) / (3 * m) / m,
+    lambda l: (l(m) / sec) * (m / sec),
+    lambda l: l(m / sec) + km / hr,
+    lambda l: l(2 * km) + 3 * m,
+    lambda l: l(1.5 * hr) + 30 * min,
+    lambda l: l(1 * hr) + 2,
+    lambda l: (2 * day) * l(12 * hr),
+    lambda l: l(2 * min) - 5 * sec,
+    lambda l: l(km) ** 2 / (3 * m),
+    lambda l: l(7 * hr) // (2 * hr),
+])
+def test_lazy_matches_eager(build):
+    eager = build(lambda v: v)
+    deferred = build(lazy)
+    assert isinstance(deferred, Expression)
+    res = deferred.evaluate()
+    assert res.units == eager.units
+    assert float(res) == pytest.approx(float(eager))
+
+
+def test_incompatible_units():
+    with pytest.raises(AssertionError):
+        (lazy(m) + sec).evaluate()
+
+
+def test_compiled_plan_is_cached_and_replayed():
+    expression = lazy(2 * km) / (4 * min)
+    compiled = expression.compile()
+    assert (lazy(6 * km) / (3 * min)).compile() is compiled
+    assert str(compiled(3 * km, 1 * min)) == "3 km/min"
+    assert str(compiled(3, 1)) == "3 km/min"
+    with pytest.raises(AssertionError):
+        compiled(3 * m, 1 * min)
+
+
+def test_arrays():
+    np = pytest.importorskip("numpy")
+    distances = np.array([1, 2, 3]) >> km
+    res = (lazy(distances) + 500 * m).evaluate()
+    assert res.units == {"m": 1}
+    assert res.value.tolist() == [1500, 2500, 3500]
@@ -0,0 +1,29 @@
+import pytest
+
+import units as u
+from units.formatting import format_units, format_many
+from units.constants.time import *
+from units.constants.length import *
+
+
+def test_suffix_is_cached_per_signature():
+    assert u._format_units((m / sec ** 2).units) is u._format_units((2 * m / sec ** 2).units)
+    assert str(float("inf") * m) == "inf m"
+
+
+def test_format_units_precision():
+    assert format_units(7.2 * km / hr) == "7.2 km/hr"
+    assert format_units(2 * m / 3, precision=2) == "0.67 m"
+
+
+def test_format_many():
+    values = [1 * hr, 1.5 * hr, 2 * m / sec]
+    assert format_many(values) == [str(v) for v in values]
+    assert format_many(values, precision=1) == ["1.0 hr", "1.5 hr", "2.0 m/sec"]
+
+
+def test_format_many_array():
+    np = pytest.importorskip("numpy")
+    a = np.array([[1, 2.5], [3, 4]]) >> km / hr
+    assert format_many(a) == ["1 km/hr", "2.5 km/hr", "3 km/hr", "4 km/hr"]
+    assert format_many(a, precision=2)[1] == "2.50 km/hr"
@@ -0,0 +1,33 @@
+import pytest
+
+from units.constants.length import m
+from units.constants.time import sec, min, hr, day
+from units.index import QuantityIndex
+
+
+def test_range_and_nearest():
+    jobs = QuantityIndex([90 * sec, 1 * hr, 3 * min, 3 * hr, 5 * min])
+    assert [str(v) for v in jobs] == ["90 sec", "3 min", "5 min", "1 hr", "3 hr"]
+    assert [str(v) for v in jobs.range(5 * min, 2 * hr)] == ["5 min", "1 hr"]
+    assert [str(v) for v in jobs.range(5 * min, 1 * hr, include_low=False, include_high=False)] == []
+    assert [str(v) for v in jobs.range(high=180 * sec)] == ["90 sec", "3 min"]
+    assert str(jobs.nearest(2 * hr)) == "1 hr"
+    assert str(jobs.nearest(1 * day)) == "3 hr"
+
+
+def test_insert_keeps_order():
+    index = QuantityIndex(units=sec)
+    for v in (2 * hr, 10 * sec, 1 * min):
+        index.add(v)
+    index.update([30 * sec])
+    assert [str(v) for v in index] == ["10 sec", "30 sec", "1 min", "2 hr"]
+    assert len(index) == 4
+
+
+def test_rejects_incompatible_units():
+    index = QuantityIndex([1 * sec])
+    with pytest.raises(AssertionError):
+        index.add(1 * m)
+    with pytest.raises(AssertionError):
+        index.range(1 * m)
+    assert len(index) == 1
@@ -24,9 +24,9 @@ def test_conversion():
         print(sec / m >> km / hr)
 
 
-def test_unit_vector():
+def test_unit_signature():
     test_unit = u.Units(1, {"m": 1, "sec": -1})
-    assert u._units_to_vector(test_unit) == [0, -1, 0, 0, 0, 0, 0, 0, 1, 0]
+    assert test_unit.units == {"m": 1, "sec": -1}
 
 
 def test_multiplication():
@@ -67,3 +67,50 @@ def test_equal():
     d[1 * min] = "a"
     d[60 * sec] = "b"
     assert str(d) == "{1 min: 'b'}"
+
+
+def test_signature_interning():
+    assert (m * m).units is (m ** 2).units
+    assert (m / sec).units is (2 * m / sec).units
+    assert (m / sec).units == {"m": 1, "sec": -1}
+    assert u.Signature({"sec": -1, "m": 1}) == u.Signature({"m": 1, "sec": -1})
+    assert hash(u.Signature({"sec": -1, "m": 1})) == hash(u.Signature({"m": 1, "sec": -1}))
+    assert u.Signature({"s": 0, "m": -1}) is u.Signature({"m": -1})
+    assert (m / sec).units * sec.units is m.units
+
+
+def test_signature_memos_are_bounded():
+    for i in range(2 * u.SIGNATURE_MEMO_SIZE):
+        m.units ** (i + 2)
+        m.units * sec.units ** (i + 1)
+    assert len(m.units._powers) <= u.SIGNATURE_MEMO_SIZE
+    assert len(m.units._products) <= u.SIGNATURE_MEMO_SIZE
+
+
+def test_signature_result_order_follows_registry():
+    assert list((sec * m).units) == list((m * sec).units)
+
+
+def test_compact_layout():
+    a, b = 2 * m / sec, 3 * m / sec
+    assert not hasattr(a, "__dict__")
+    assert not hasattr(m, "__dict__")
+    assert a.units is b.units
+    assert a.value == 2.0
+
+
+def test_pickling():
+    import pickle
+    a = pickle.loads(pickle.dumps([2 * m / sec, km]))
+    assert str(a) == "[2 m/sec, 1 km]"
+    assert isinstance(a[1], u.SingleUnits)
+    assert a[0].units is (m / sec).units
+
+
+def test_single_units_interning():
+    speed = m / sec
+    assert speed is m / sec
+    assert (2 * m) / (2 * sec) is speed
+    assert u.SingleUnits({"m": 1}) is m
+    a = 2 * speed
+    assert a >> speed is a
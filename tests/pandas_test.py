@@ -0,0 +1,67 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from units.constants.length import m, km
+from units.constants.time import sec, hr
+from units.pandas import UnitsDtype, UnitsExtensionArray
+
+
+def test_dtype():
+    dtype = UnitsDtype(m / sec)
+    assert dtype.name == "units[m/sec]"
+    assert UnitsDtype.construct_from_string("units[m/sec]") == dtype
+    assert pd.api.types.pandas_dtype("units[km/hr]") == UnitsDtype(km / hr)
+    with pytest.raises(TypeError):
+        UnitsDtype.construct_from_string("units[parsec]")
+
+
+def test_series_arithmetic_and_conversion():
+    s = pd.Series([1, 2, 3], dtype="units[m/sec]")
+    assert str(s[0]) == "1 m/sec"
+    doubled = s * 2 + 3.6 * km / hr
+    assert doubled.dtype == UnitsDtype(m / sec)
+    assert list(doubled.astype(float)) == pytest.approx([3, 5, 7])
+    converted = s >> km / hr
+    assert converted.dtype == UnitsDtype(km / hr)
+    assert list(converted.astype(float)) == pytest.approx([3.6, 7.2, 10.8])
+    assert (s * (2 * sec)).dtype == UnitsDtype(m)
+    assert list(s > 7.2 * km / hr) == [False, False, True]
+    with pytest.raises(AssertionError):
+        s + 1 * m
+
+
+def test_construction_reductions_and_display():
+    s = pd.Series([1 * km / hr, 1 * m / sec, None], dtype=UnitsDtype(km / hr))
+    assert s.isna().tolist() == [False, False, True]
+    assert str(s.sum()) == "4.6 km/hr"
+    assert str(s.max()) == "3.6 km/hr"
+    assert "units[km/hr]" in repr(s)
+    assert "3.6 km/hr" in repr(s.array)
+    frame = pd.DataFrame({"speed": s, "n": [1, 2, 3]})
+    assert frame.dropna()["speed"].dtype == UnitsDtype(km / hr)
+    assert len(pd.concat([s, s >> m / sec])) == 6
+
+
+def test_setitem_converts():
+    array = UnitsExtensionArray([1.0, 2.0], m / sec)
+    array[0] = 7.2 * km / hr
+    assert array[0].value == pytest.approx(2)
+
+
+def test_sorting_and_hashing_use_magnitudes():
+    s = pd.Series([3, 1, 2], dtype="units[m/sec]")
+    assert list(s.argsort()) == [1, 2, 0]
+    assert list(s.nlargest(2).index) == [0, 2]
+    assert s.to_numpy().tolist() == [3, 1, 2]
+    assert len(set(pd.util.hash_pandas_object(s, index=False))) == 3
+    assert s.to_json() == '{"0":3.0,"1":1.0,"2":2.0}'
+
+
+def test_concat_and_comparison_with_other_types():
+    s = pd.concat([pd.Series([1, 2], dtype="units[m/sec]"), pd.Series([3.6], dtype="units[km/hr]")])
+    assert s.dtype == UnitsDtype(m / sec)
+    assert list(s.astype(float)) == pytest.approx([1, 2, 1])
+    assert pd.concat([s, pd.Series([1], dtype="units[sec]")]).dtype == object
+    assert list(s == "a") == [False, False, False]
+    assert list(s != "a") == [True, True, True]
@@ -0,0 +1,37 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from units.constants.length import m, km
+from units.constants.time import sec, hr
+from units.parallel import parallel_convert, ConvertedBuffer
+
+
+def test_array_module_buffer():
+    res = parallel_convert(array("d", range(10)), km / hr, from_units=m / sec, workers=2, threshold=0)
+    assert isinstance(res, ConvertedBuffer)
+    assert res.units == km / hr
+    assert list(res.values) == pytest.approx([i * 3.6 for i in range(10)])
+
+
+def test_units_array_with_shared_executor():
+    np = pytest.importorskip("numpy")
+    values = np.arange(12.0).reshape(3, 4) >> m / sec
+    with ProcessPoolExecutor(3) as executor:
+        res = parallel_convert(values, km / hr, executor=executor, threshold=0)
+        again = parallel_convert(res, m / sec, executor=executor, threshold=0)
+    assert res.units == (km / hr).units
+    assert res.shape == (3, 4)
+    assert np.allclose(res.value, values.value * 3.6)
+    assert np.allclose(again.value, values.value)
+
+
+def test_small_buffers_convert_in_process():
+    res = parallel_convert(array("f", [1, 2]), m, from_units=km)
+    assert list(res.values) == [1000, 2000]
+
+
+def test_incompatible_units():
+    with pytest.raises(AssertionError):
+        parallel_convert(array("d", [1]), sec, from_units=m, threshold=0)
@@ -0,0 +1,43 @@
+import pytest
+
+import units as u
+from units.parser import parse_units, parse_many, parse_array, parse_signature
+from units.constants.time import *
+from units.constants.length import *
+
+
+@pytest.mark.parametrize("value", [
+    7.2 * km / hr, 2 * m * sec ** 2, u.Units(2, {"sec": -2}), u.Units(2, {"m": -1, "sec": -2}),
+    2 * m / sec ** 2, (m / sec) * (m / sec), 2 * m / (3 * m) / m, -1.5 * km, 1e-05 * km, m / m,
+])
+def test_round_trip(value):
+    parsed = parse_units(str(value))
+    assert parsed.units == value.units
+    assert str(parsed) == str(value)
+
+
+def test_parsed_suffix_is_cached():
+    assert parse_signature("km/hr") is parse_signature("km/hr")
+    assert parse_signature("(m*sec^2)") == (m * sec ** 2).units
+
+
+def test_unknown_units_and_bad_input():
+    with pytest.raises(ValueError):
+        parse_units("2 parsecs")
+    with pytest.raises(ValueError):
+        parse_units("two m")
+    with pytest.raises(ValueError):
+        parse_units("2 m^x")
+
+
+def test_parse_many():
+    assert parse_many(["1 hr", "30 min"]) == [1 * hr, 30 * min]
+
+
+def test_parse_array():
+    pytest.importorskip("numpy")
+    a = parse_array(["1 km/hr", "2 km/hr", "1 m/sec"])
+    assert a.units == {"km": 1, "hr": -1}
+    assert a.value.tolist() == [1, 2, 3.6]
+    with pytest.raises(AssertionError):
+        parse_array(["1 km", "1 sec"])
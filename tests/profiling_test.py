@@ -0,0 +1,62 @@
+import pytest
+
+from units import Units, UnitRegistry, use_registry, clear_conversion_cache, _convert_unit
+from units.constants.length import m, km
+from units.constants.time import sec, hr
+from units.profiling import profile, enable, disable
+
+
+def test_profile_counts_hot_paths():
+    add = Units.__add__
+    clear_conversion_cache()
+    with profile() as p:
+        (2 * m / sec + 3 * km / hr) >> km / hr
+        m(2 * m)
+        hash(2 * m)
+    assert Units.__add__ is add
+    stats = p.stats()
+    assert stats["operator.__add__"]["calls"] == 1
+    assert stats["dispatch.plan"]["calls"] >= 1
+    assert stats["conversion.identity"]["calls"] == 1
+    assert stats["operator.__hash__"]["calls"] == 1
+    assert stats["allocation.Units"]["calls"] > 0
+    assert sum(stats["conversion.convert"]["histogram"].values()) == 2
+    assert "operator.__add__" in p.report()
+
+
+def test_cached_dispatch_plans_count_conversions():
+    with profile() as p:
+        for _ in range(200):
+            2 * m + 3 * km
+            1 * km < 5 * m
+            2 * m + 3 * m
+    assert p.counts["alignment.converted"] >= 2 * 200 - 2
+    assert __import__("units")._profile_hook is None
+
+
+def test_array_conversions_are_counted():
+    pytest.importorskip("numpy")
+    from units.array import UnitsArray
+    with profile() as p:
+        UnitsArray([1, 2], m.units) >> km
+        UnitsArray([1, 2], m.units) + 1 * km
+    assert p.counts["conversion.convert"] == 1
+    assert p.counts["alignment.align"] == 1
+
+
+def test_profiling_is_per_registry():
+    tenant = UnitRegistry()
+    events = []
+    p = enable(tenant, callback=lambda name, elapsed: events.append(name))
+    try:
+        2 * m + 1 * m
+        with use_registry(tenant):
+            tenant.create_units(group_name="Scale", small=1, big=10)
+            small, big = tenant.load_units("small", "big")
+            big >> small
+    finally:
+        assert disable(tenant) is p
+    assert "registry.create_units" in p.counts
+    assert "operator.__rshift__" in events
+    assert "operator.__add__" not in p.counts
+    assert _convert_unit is __import__("units")._convert_unit
@@ -0,0 +1,30 @@
+import pytest
+
+from units.constants.length import m, km
+from units.constants.time import ms, sec, min, hr
+from units.reductions import total, mean, minimum, maximum
+
+
+def test_total_in_smallest_unit():
+    assert str(total([1 * hr, 30 * min, 45 * sec])) == "5445 sec"
+    assert str(total((i * min for i in range(4)), to_units=hr)) == "0.1 hr"
+    assert str(total([], to_units=sec)) == "0 sec"
+
+
+def test_mean_min_max():
+    durations = [1 * hr, 30 * min, 90 * min]
+    assert str(mean(durations)) == "60 min"
+    assert str(minimum(durations, to_units=hr)) == "0.5 hr"
+    assert str(maximum(iter(durations))) == "90 min"
+    fastest = maximum([2 * m / sec, 3 * km / hr])
+    assert fastest.units == (km / hr).units and fastest.value == pytest.approx(7.2)
+    assert str(minimum([1 * sec, 5 * ms])) == "5 ms"
+
+
+def test_invalid_input():
+    with pytest.raises(AssertionError):
+        total([1 * m, 1 * sec])
+    with pytest.raises(AssertionError):
+        total([1 * m], to_units=sec)
+    with pytest.raises(ValueError):
+        mean([])
@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+import units as u
+from units import UnitRegistry, use_registry, get_registry, create_units, load_units
+
+
+def test_registries_are_isolated():
+    tenant = UnitRegistry()
+    tenant.create_units(group_name="Money", cent=1, dollar=100)
+    assert "cent" not in u.unit_to_group
+    with use_registry(tenant):
+        assert get_registry() is tenant
+        cent, dollar = load_units("cent", "dollar")
+        assert str(2 * dollar >> cent) == "200 cent"
+        assert 1 * dollar == 100 * cent
+    assert get_registry() is u.DEFAULT_REGISTRY
+    assert "dollar" not in u.unit_to_group
+
+
+def test_same_unit_names_in_different_registries():
+    first, second = UnitRegistry(), UnitRegistry()
+    small, big = first.create_units(group_name="Scale", small=1, big=10)
+    second.create_units(group_name="Scale", small=1, big=1000)
+    with use_registry(first):
+        assert str(big >> small) == "10 small"
+    with use_registry(second):
+        assert str(big >> small) == "1000 small"
+        assert hash(big) == hash(1000 * small)
+
+
+def test_create_groups_is_atomic():
+    registry = UnitRegistry()
+    with pytest.raises(AssertionError):
+        registry.create_groups({"Good": {"a": 1, "b": 2}, "Bad": {"c": "x"}})
+    assert registry.load_units() is None
+    packs = registry.create_groups({"Good": {"a": 1, "b": 2}, "Other": {"c": 1, "d": 3}})
+    assert str(packs["Other"].d) == "1 d"
+    with use_registry(registry):
+        assert str(packs["Good"].b >> packs["Good"].a) == "2 a"
+
+
+def test_copy_shares_definitions_until_changed():
+    registry = UnitRegistry()
+    registry.create_units(group_name="Scale", small=1, big=10)
+    copy = registry.copy()
+    copy.destroy_units("Scale")
+    assert copy.load_units() is None
+    assert registry.load_units("big") is not None
+
+
+def test_module_attributes():
+    create_units(group_name="AttrUnits", attr_small=1, attr_big=10)
+    assert str(u.attr_big) == "1 attr_big"
+    assert u.unit_to_weight["attr_big"] == 10
+    with pytest.raises(AttributeError):
+        print(u.not_a_unit)
+    u.destroy_units("AttrUnits")
+
+
+def test_concurrent_readers_and_writer():
+    registry = UnitRegistry()
+    small, big = registry.create_units(group_name="Scale", small=1, big=10)
+    errors = []
+
+    def read():
+        with use_registry(registry):
+            try:
+                for _ in range(2000):
+                    assert float(big >> small) == 10
+            except Exception as e:
+                errors.append(e)
+
+    def write():
+        for i in range(200):
+            registry.create_units(group_name=f"Extra{i}", **{f"extra{i}": 1})
+            registry.destroy_units(f"Extra{i}")
+
+    threads = [threading.Thread(target=read) for _ in range(4)] + [threading.Thread(target=write)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_lazy_groups_register_on_first_use():
+    registry = UnitRegistry()
+    small, big = registry.create_units(group_name="Scale", lazy=True, small=1, big=10)
+    registry.create_groups({"Other": {"tiny": 1, "huge": 100}}, lazy=True)
+    assert "_state" not in vars(registry)
+    with use_registry(registry):
+        assert str(2 * big >> small) == "20 small"
+        assert list(u.group_to_units) == ["Scale", "Other"]
+        assert load_units("big") is big
+
+
+def test_snapshot_round_trip(tmp_path):
+    source = UnitRegistry()
+    source.create_groups({"Scale": {"small": 1, "big": 10}, "Money": {"cent": 1, "dollar": 100}})
+    source.save_snapshot(str(tmp_path / "registry.json"))
+
+    restored = UnitRegistry()
+    restored.create_units(group_name="Stale", stale=1)
+    restored.load_snapshot(str(tmp_path / "registry.json"))
+    with use_registry(restored):
+        assert list(u.group_to_units) == ["Scale", "Money"]
+        assert dict(u.unit_to_weight) == {"small": 1, "big": 10, "cent": 1, "dollar": 100}
+        small, big = load_units("small", "big")
+        assert str(3 * big >> small) == "30 small"
+
+
+def test_snapshots_share_unchanged_tables():
+    registry = UnitRegistry()
+    for i in range(100):
+        registry.create_units(group_name=f"Group{i}", **{f"small{i}": 1, f"big{i}": 10})
+    before = registry._state
+    registry.create_units(group_name="Money", cent=1, dollar=100)
+    registry.destroy_units("Group0")
+    after = registry._state
+    assert "small0" in before.unit_to_group and "small0" not in after.unit_to_group
+    assert "cent" not in before.unit_to_weight and after.unit_to_weight["dollar"] == 100
+    assert list(after.group_to_units)[-2:] == ["Group99", "Money"]
+    assert after.group_tables["Group50"] is before.group_tables["Group50"]
+    shared = sum(a is b for a, b in zip(before.unit_to_group._root, after.unit_to_group._root))
+    assert shared >= len(after.unit_to_group._root) - 4
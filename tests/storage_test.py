@@ -0,0 +1,84 @@
+import pytest
+
+from units import UnitRegistry, use_registry
+from units.storage import save_series, load_series
+from units.constants.time import *
+from units.constants.length import *
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "speeds.bin")
+    values = [i * m / sec for i in range(1000)]
+    save_series(path, values)
+    with load_series(path) as series:
+        assert len(series) == 1000
+        assert series.units == {"m": 1, "sec": -1}
+        assert series[10] == 10 * m / sec
+        assert series[-1] == 999 * m / sec
+        assert series[1:3] == [1 * m / sec, 2 * m / sec]
+        assert list(series) == values
+        with pytest.raises(IndexError):
+            print(series[1000])
+
+
+def test_generator_of_numbers(tmp_path):
+    path = str(tmp_path / "durations.bin")
+    save_series(path, (i / 2 for i in range(100000)), units=min)
+    with load_series(path) as series:
+        assert len(series) == 100000
+        assert str(series[3]) == "1.5 min"
+
+
+def test_mixed_units_are_rejected(tmp_path):
+    with pytest.raises(AssertionError):
+        save_series(str(tmp_path / "bad.bin"), [1 * m, 1 * sec])
+
+
+def test_conversion_to_current_weights(tmp_path):
+    path = str(tmp_path / "scaled.bin")
+    old, new = UnitRegistry(), UnitRegistry()
+    small, big = old.create_units(group_name="Scale", small=1, big=10)
+    new.create_units(group_name="Scale", small=1, big=100)
+    with use_registry(old):
+        save_series(path, [2 * big, 3 * big])
+    with use_registry(new), load_series(path) as series:
+        assert series.scaler == pytest.approx(0.1)
+        assert float(series[0]) == pytest.approx(0.2)
+    with use_registry(UnitRegistry()):
+        with pytest.raises(ValueError):
+            load_series(path)
+
+
+def test_memory_mapped_array(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "array.bin")
+    save_series(path, np.arange(10) >> km)
+    series = load_series(path)
+    a = series.to_array()
+    assert a.units == {"km": 1}
+    assert a.value.tolist() == list(range(10))
+    assert not a.value.flags.owndata
+    del a
+    series.close()
+
+
+def test_close_with_live_views(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "views.bin")
+    save_series(path, np.arange(10) >> km)
+    with load_series(path) as series:
+        speeds = series.to_array()
+        view = series.raw()
+        values = iter(series)
+        next(values)
+    assert speeds.value.tolist() == list(range(10))
+    assert len(view) == 80
+
+
+def test_save_loaded_series(tmp_path):
+    path, copy = str(tmp_path / "original.bin"), str(tmp_path / "copy.bin")
+    save_series(path, [i * m for i in range(5)])
+    with load_series(path) as series:
+        save_series(copy, series)
+    with load_series(copy) as series:
+        assert list(series) == [i * m for i in range(5)]
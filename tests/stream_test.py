@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from units.stream import iter_convert, aiter_convert
+from units.constants.time import *
+from units.constants.length import *
+
+
+def test_stream_is_lazy():
+    consumed = []
+
+    def readings():
+        for i in range(1, 1000):
+            consumed.append(i)
+            yield i * m / sec
+
+    stream = (km / hr).stream(readings())
+    assert len(consumed) == 0
+    assert str(next(stream)) == "3.6 km/hr"
+    assert len(consumed) == 1
+
+
+def test_stream_mixed_inputs():
+    res = list(iter_convert([1, 2 * km, 300 * m], km))
+    assert str(res) == "[1 km, 2 km, 0.3 km]"
+
+
+def test_stream_nesting():
+    stream = iter_convert([[1 * hr, 30 * min], [2 * hr]], min)
+    assert [str(list(inner)) for inner in stream] == ["[60 min, 30 min]", "[120 min]"]
+
+
+def test_stream_chunks():
+    chunks = list(sec.stream((i * ms for i in range(0, 5000, 1000)), chunk_size=2))
+    assert str(chunks) == "[[0 sec, 1 sec], [2 sec, 3 sec], [4 sec]]"
+
+
+def test_stream_array_chunks():
+    pytest.importorskip("numpy")
+    chunks = list(sec.stream((i * ms for i in range(0, 5000, 1000)), chunk_size=3, as_array=True))
+    assert [c.value.tolist() for c in chunks] == [[0, 1, 2], [3, 4]]
+    assert chunks[0].units == {"sec": 1}
+
+
+def test_stream_incompatible_units():
+    with pytest.raises(AssertionError):
+        list(iter_convert([1 * m], sec))
+
+
+async def _readings(values, delay=0):
+    for v in values:
+        if delay:
+            await asyncio.sleep(delay)
+        yield v
+
+
+async def _collect(stream):
+    return [batch async for batch in stream]
+
+
+def test_async_batches():
+    source = _readings([1 * m / sec, "7.2 km/hr", 3, "1 m/sec"])
+    batches = asyncio.run(_collect(aiter_convert(source, km / hr, from_units=m / sec, batch_size=3)))
+    assert [[str(v) for v in batch] for batch in batches] == [["3.6 km/hr", "7.2 km/hr", "10.8 km/hr"],
+                                                              ["3.6 km/hr"]]
+
+
+def test_async_time_window_and_offload():
+    pytest.importorskip("numpy")
+    with ThreadPoolExecutor(1) as executor:
+        stream = aiter_convert(_readings(range(6), delay=0.02), m, from_units=km, batch_size=100,
+                               max_delay=0.05, as_array=True, executor=executor, offload_size=2)
+        batches = asyncio.run(_collect(stream))
+    assert 1 < len(batches) < 6
+    assert [v for batch in batches for v in batch.value] == [i * 1000 for i in range(6)]
+
+
+def test_async_backpressure():
+    produced = []
+
+    async def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    async def take_first():
+        stream = aiter_convert(source(), sec, batch_size=5)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.01)
+        await stream.aclose()
+        return first
+
+    assert len(asyncio.run(take_first())) == 5
+    assert len(produced) <= 12
+
+
+def test_async_source_error():
+    async def failing():
+        yield 1 * sec
+        raise ValueError("connection lost")
+
+    async def run():
+        res = []
+        with pytest.raises(ValueError):
+            async for batch in aiter_convert(failing(), ms):
+                res.append(batch)
+        return res
+
+    assert [[str(v) for v in batch] for batch in asyncio.run(run())] == [["1000 ms"]]
@@ -36,7 +36,8 @@ def test_multiplication_by_number():
 
 
 def test_multiplication_by_time():
-    assert (2 * day) * (12 * hr) == 576 * hr  # cause 2 day * 0.5 day = 1 day
+    assert (2 * day) * (12 * hr) == 576 * hr ** 2  # cause 48 hr * 12 hr = 576 hr^2
+    assert (2 * day) * (12 * hr) != 576 * hr
 
 
 def test_division_by_time():
@@ -61,7 +62,8 @@ def test_different_units_equality():
 def test_correct_power():
     assert 1 / sec == sec(1) ** -1
     assert sec(2) ** 2 != 2 * sec ** 2
-    assert math.sqrt(sec ** 2) == sec
+    assert math.sqrt(sec ** 2) == float(sec)  # math functions return plain numbers
+    assert (sec ** 2) ** 0.5 == sec
     assert min ** 5 / min ** 2 == min ** 3
     with pytest.raises((AttributeError, AssertionError, ValueError)):
         sec ** sec
@@ -88,4 +90,20 @@ def test_comparison_and_hashes():
 def test_different_groups():
     # print(convert_unit(m/sec, km/hr))
     # print(m >> km)
-    print(m / sec + m / sec)
\ No newline at end of file
+    print(m / sec + m / sec)
+
+
+def test_canonical_hash_and_equality():
+    assert 1 * m != 1 * sec
+    assert 1 * sec not in {1 * m: "length"}
+    assert 2 * m != 2 and 1 * hr != 1
+    assert {1: "x"}.get(1 * hr) is None
+    assert hr / min == 60 and hash(hr / min) == hash(60)
+    assert hash(1 * hr) == hash(60 * min) == hash(3600 * sec)
+    assert 1 * hr == 60 * min
+    assert not (1 * hr != 60 * min)
+    assert 1 * hr != 61 * min
+    assert 60 * min in {1 * hr}
+    assert hash(2 * day / (2 * day)) == hash(1)
+    s = {1 * hr, 60 * min, 3600 * sec, 2 * hr}
+    assert len(s) == 2
@@ -0,0 +1,87 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import units as u
+from units.array import UnitsArray
+from units.constants.time import *
+from units.constants.length import *
+
+
+def test_ndarray_conversion():
+    a = np.array([[1, 2, 3], [4, 5, 6]]) >> m / sec ** 2
+    assert isinstance(a, UnitsArray)
+    assert a.units == {"m": 1, "sec": -2}
+    assert a.shape == (2, 3)
+    b = a >> km / hr ** 2
+    assert isinstance(b, UnitsArray)
+    assert b.units == {"km": 1, "hr": -2}
+    assert np.allclose(b.value, [[12960, 25920, 38880], [51840, 64800, 77760]])
+
+
+def test_small_list_conversion_keeps_lists():
+    a = [[1, 2, 3], [4, 5, 6]] >> m / sec ** 2
+    assert isinstance(a, list)
+    assert str(a) == "[[1 m/sec^2, 2 m/sec^2, 3 m/sec^2], [4 m/sec^2, 5 m/sec^2, 6 m/sec^2]]"
+
+
+def test_large_list_conversion():
+    a = list(range(u.ARRAY_CONVERSION_THRESHOLD)) >> m
+    assert isinstance(a, UnitsArray)
+    assert str((a >> km).max()) == str(km(float(u.ARRAY_CONVERSION_THRESHOLD - 1) * m))
+
+
+def test_large_list_with_units_items():
+    values = [1] * (u.ARRAY_CONVERSION_THRESHOLD - 1) + [2 * km]
+    a = values >> m
+    assert isinstance(a, list)
+    assert str(a[-1]) == "2000 m"
+    with pytest.raises(AssertionError):
+        [1] * (u.ARRAY_CONVERSION_THRESHOLD - 1) + [2 * sec] >> m
+
+
+def test_scalar_ufuncs():
+    assert np.sqrt(4 * m) == 2.0
+    assert not np.isnan(4 * m)
+    assert str(np.add(1 * km, 1 * m)) == "1001 m"
+    assert str(np.array([1, 2]) * km) == "[1., 2.] km"
+    assert list(np.array([1, 3]) < 2 * km) == [True, False]
+
+
+def test_arithmetic():
+    a = np.array([1, 2, 3]) >> km
+    assert np.allclose((a + 1 * m).value, [1001, 2001, 3001])
+    assert (a + 1 * m).units == {"m": 1}
+    assert np.allclose((a - a).value, [0, 0, 0])
+    assert np.allclose((a * (2 * m)).value, [2000, 4000, 6000])
+    assert (a * m).units == {"m": 2}
+    assert np.allclose((a / (2 * hr)).value, [0.5, 1, 1.5])
+    assert (a / hr).units == {"km": 1, "hr": -1}
+    assert np.allclose((1 / a).value, [1, 0.5, 1 / 3])
+    assert np.allclose((a ** 2).value, [1, 4, 9])
+    assert (a ** 2).units == {"km": 2}
+    assert np.allclose((np.arange(3) * m).value, [0, 1, 2])
+    assert np.allclose((m * np.arange(3)).value, [0, 1, 2])
+    with pytest.raises(AssertionError):
+        print(a + 1 * sec)
+
+
+def test_comparison():
+    a = np.array([1, 2, 3]) >> m
+    assert list(a > 2 * m) == [False, False, True]
+    assert list(a == np.array([0.001, 1, 1]) * km) == [True, False, False]
+    assert list(1 * m < a) == [False, True, True]
+    with pytest.raises(AssertionError):
+        print(a < 1 * sec)
+
+
+def test_reductions_and_indexing():
+    a = np.array([[1, 2], [3, 4]]) >> hr
+    assert a.sum() == 10 * hr
+    assert a.mean() == 150 * min
+    assert a.min() == 1 * hr
+    assert a.max() == 4 * hr
+    assert np.allclose(a.sum(axis=0).value, [4, 6])
+    assert a[1, 0] == 3 * hr
+    assert isinstance(a[0], UnitsArray)
+    assert str(a.tolist()) == "[[1 hr, 2 hr], [3 hr, 4 hr]]"
@@ -1,19 +1,243 @@
+import importlib.util
+import json
+import operator
+import threading
+# aliased: the units.array submodule is bound to the name array in this package once imported
+from array import array as _array
 from collections import OrderedDict, namedtuple
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from itertools import count
 from numbers import Number
-from typing import List, Union, Iterable, NamedTuple
+from types import MappingProxyType
+from typing import Dict, List, Union, Iterable, NamedTuple
+from weakref import WeakValueDictionary
 
 from units.constants import PREDEFINED_GROUP_LIST
 
+# Sequences at least this long are converted by `>>` into a single UnitsArray instead of nested lists
+ARRAY_CONVERSION_THRESHOLD = 1024
+
+# set by units.profiling while any registry is profiled, called with the name of an event to count
+_profile_hook = None
+
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
 
 def align_arguments(func):
+    name = func.__name__
+    float_operator = _FLOAT_OPERATORS.get(name)
+
     def wrapper(*args):
+        if len(args) == 2:
+            self, other = args
+            if float_operator is not None and isinstance(other, Number):
+                # dispatch plan: operand scalers and result units for this operator and pair of signatures
+                other_units = other.units if isinstance(other, Units) else None
+                state = _active_registry.get()._state
+                plan = state.dispatch_cache.get((name, self.units, other_units))
+                if plan is None:
+                    plan = _dispatch_plan(func, self, other, state)
+                    state.dispatch_cache.put((name, self.units, other_units), plan)
+                left_scaler, right_scaler, units = plan
+                if left_scaler == 1 and right_scaler == 1:
+                    value = float_operator(float(self), float(other))
+                else:
+                    if _profile_hook is not None:
+                        _profile_hook("alignment.converted")
+                    value = float_operator(float(self) * left_scaler, float(other) * right_scaler)
+                return value if units is None else _create_units_object(value, units)
+            if _is_array_like(other):
+                return _array_operation(self, name, other)
         new_args = _align_units(*args)
         return func(*new_args)
 
     return wrapper
 
 
+# float counterparts of the operators handled by the dispatch cache, called with (self, other)
+_FLOAT_OPERATORS = {
+    "__add__": operator.add, "__radd__": operator.add,
+    "__sub__": operator.sub, "__rsub__": lambda a, b: b - a,
+    "__mul__": operator.mul,
+    "__truediv__": operator.truediv, "__rtruediv__": lambda a, b: b / a,
+    "__floordiv__": operator.floordiv, "__rfloordiv__": lambda a, b: b // a,
+    "__lt__": operator.lt, "__le__": operator.le, "__gt__": operator.gt, "__ge__": operator.ge,
+}
+
+
+def _is_array_like(obj) -> bool:
+    return not isinstance(obj, Number) and hasattr(type(obj), "__array_ufunc__")
+
+
+def _array_operation(v, operator_name: str, other):
+    if getattr(other, "_defers_units_operators", False):
+        return NotImplemented  # the other operand implements the reflected operator itself
+    from units.array import UnitsArray
+    return getattr(UnitsArray(float(v), v.units), operator_name)(other)
+
+
+class Signature(Mapping):
+    """
+    Immutable sparse mapping {unit name: power} describing the units of a value.
+    Signatures are interned, so equal unit combinations share one object and compare by identity,
+    and results of multiplication, division and raising to a power are cached per signature.
+    Signatures do not depend on a registry, so they are shared by all of them.
+    """
+    __slots__ = ("_units", "_hash", "_products", "_quotients", "_powers", "_base", "_suffix", "__weakref__")
+
+    _interned = WeakValueDictionary()
+
+    def __new__(cls, units: Union[Mapping, Iterable] = ()):
+        if type(units) is Signature:
+            return units
+        items = tuple((u, p) for u, p in (units.items() if isinstance(units, Mapping) else units) if p != 0)
+        signature = cls._interned.get(items)
+        if signature is None:
+            signature = super().__new__(cls)
+            signature._units = dict(items)
+            signature._hash = hash(frozenset(items))
+            signature._products = {}
+            signature._quotients = {}
+            signature._powers = {}
+            signature._base = None
+            signature._suffix = None
+            cls._interned[items] = signature
+        return signature
+
+    def __getitem__(self, unit):
+        return self._units[unit]
+
+    def __iter__(self):
+        return iter(self._units)
+
+    def __len__(self):
+        return len(self._units)
+
+    def __contains__(self, unit):
+        return unit in self._units
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, Signature):
+            return self._hash == other._hash and self._units == other._units
+        if isinstance(other, Mapping):
+            return self._units == {u: p for u, p in other.items() if p != 0}
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __repr__(self):
+        return f"Signature({self._units})"
+
+    def __reduce__(self):
+        return Signature, (tuple(self._units.items()),)
+
+    def _combine(self, other: "Signature", sign: int) -> "Signature":
+        units = dict(self._units)
+        for u, p in other._units.items():
+            units[u] = units.get(u, 0) + sign * p
+        return Signature(sorted(units.items(), key=lambda item: _unit_order.get(item[0], float("inf"))))
+
+    def __mul__(self, other: "Signature") -> "Signature":
+        res = self._products.get(other)
+        if res is None:
+            res = _memoize_signature(self._products, other, self._combine(other, 1))
+        return res
+
+    def __truediv__(self, other: "Signature") -> "Signature":
+        res = self._quotients.get(other)
+        if res is None:
+            res = _memoize_signature(self._quotients, other, self._combine(other, -1))
+        return res
+
+    def __pow__(self, power: Number) -> "Signature":
+        res = self._powers.get(power)
+        if res is None:
+            res = _memoize_signature(self._powers, power, Signature((u, power * p) for u, p in self._units.items()))
+        return res
+
+
+# Maximum number of results remembered per signature and operation. The memos hold the results strongly,
+# so they are bounded to let the derived signatures of long-lived ones, e.g. registered units, be released
+SIGNATURE_MEMO_SIZE = 64
+
+
+def _memoize_signature(memo: dict, key, signature: Signature) -> Signature:
+    if len(memo) >= SIGNATURE_MEMO_SIZE:
+        try:
+            del memo[next(iter(memo))]
+        except (KeyError, RuntimeError, StopIteration):
+            pass  # evicted concurrently by another thread
+    memo[key] = signature
+    return signature
+
+
+EMPTY_SIGNATURE = Signature()
+
+CacheInfo = namedtuple("CacheInfo", "hits misses maxsize currsize")
+
+# Maximum number of entries kept by each of the conversion caches
+CONVERSION_CACHE_SIZE = 4096
+
+
+class _BoundedCache:
+    """
+    Dictionary cache which evicts its oldest entry when full
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if len(self._data) >= self.maxsize:
+            try:
+                del self._data[next(iter(self._data))]
+            except (KeyError, RuntimeError, StopIteration):
+                pass  # evicted concurrently by another thread
+        self._data[key] = value
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+IDENTITY_CONVERSION = (1, None)
+
+# Position of every unit name ever registered. Result signatures list their units in this order
+_unit_order = {}
+_unit_counter = count()
+
+
+def _signature_of(v) -> Signature:
+    return v.units if isinstance(v, Units) else EMPTY_SIGNATURE
+
+
 class Units(float):
+    # the float base is the only stored magnitude, units reference a shared interned Signature
+    __slots__ = ("units",)
 
     def __new__(cls, value: float, units: dict):
         assert type(value) == int or type(value) == float, \
@@ -21,81 +245,47 @@ class Units(float):
         return float.__new__(cls, value)
 
     def __init__(self, value: float, units: dict):
-        self.value: float = value
-        self.units: dict = units
+        self.units: Signature = Signature(units)
+
+    @property
+    def value(self) -> float:
+        return float(self)
+
+    def __reduce__(self):
+        return _create_units_object, (float(self), self.units)
 
     def __str__(self):
-        v = self.value if self.value % 1 > 0 else int(self.value)
-        split_units = [[], []]
-        for u in self.units:
-            if self.units[u] > 0:
-                split_units[0].append(u)
-            elif self.units[u] < 0:
-                split_units[1].append(u)
-
-        def _unit_string(unit, power):
-            if power > 1:
-                return f"{unit}^{power}"
-            elif power == 1:
-                return f"{unit}"
-            elif power == 0:
-                return ""
-
-        lines = [
-            "*".join([_unit_string(u, self.units[u]) for u in split_units[0]]),
-            "*".join([_unit_string(u, -self.units[u]) for u in split_units[1]])
-        ]
-        if not len(lines[0]) and len(lines[1]):
-            lines[0] = "1"
-        for i, line in enumerate(lines):
-            if len(split_units[i]) > 1:
-                lines[i] = "(" + line + ")"
-        return f"{v} {lines[0]}{'/' if len(lines[1]) else ''}{lines[1]}"
+        return f"{_format_value(float(self))} {_format_units(self.units)}"
 
     def __repr__(self):
         return self.__str__()
 
-    @staticmethod
-    def _add_vectors(vector_1, vector_2):
-        new_vector = [v1 + v2 for v1, v2 in zip(vector_1, vector_2)]
-        return _vecto_to_units(new_vector)
-
-    @staticmethod
-    def _are_vectors_same(vector_1, vector_2):
-        return all([v1 == v2 for v1, v2 in zip(vector_1, vector_2)])
-
     @align_arguments
     def __mul__(self, other):
-        return _create_units_object(float(self) * float(other),
-                                    self._add_vectors(_units_to_vector(self), _units_to_vector(other)))
+        return _create_units_object(float(self) * float(other), self.units * _signature_of(other))
 
     def __rmul__(self, other):
         return self.__mul__(other)
 
     @align_arguments
     def __truediv__(self, other):
-        return _create_units_object(float(self) / float(other),
-                                    self._add_vectors(_units_to_vector(self), _units_to_vector(other, inverse=True)))
+        return _create_units_object(float(self) / float(other), self.units / _signature_of(other))
 
     @align_arguments
     def __rtruediv__(self, other):
-        return _create_units_object(float(other) / float(self),
-                                    self._add_vectors(_units_to_vector(self, inverse=True), _units_to_vector(other)))
+        return _create_units_object(float(other) / float(self), _signature_of(other) / self.units)
 
     @align_arguments
     def __floordiv__(self, other):
-        return _create_units_object(float(self) // float(other),
-                                    self._add_vectors(_units_to_vector(self), _units_to_vector(other, inverse=True)))
+        return _create_units_object(float(self) // float(other), self.units / _signature_of(other))
 
     @align_arguments
     def __rfloordiv__(self, other):
-        return _create_units_object(float(other) // float(self),
-                                    self._add_vectors(_units_to_vector(self, inverse=True), _units_to_vector(other)))
+        return _create_units_object(float(other) // float(self), _signature_of(other) / self.units)
 
     @align_arguments
     def __add__(self, other):
-        assert isinstance(other, Number) and not isinstance(other, Units) or self._are_vectors_same(
-            _units_to_vector(self), _units_to_vector(other)), \
+        assert isinstance(other, Number) and not isinstance(other, Units) or self.units == other.units, \
             "Cannot add values with different units"
 
         return _create_units_object(float(self) + float(other), self.units)
@@ -106,37 +296,57 @@ class Units(float):
 
     @align_arguments
     def __sub__(self, other):
-        assert isinstance(other, Number) and not isinstance(other, Units) or self._are_vectors_same(
-            _units_to_vector(self), _units_to_vector(other)), \
+        assert isinstance(other, Number) and not isinstance(other, Units) or self.units == other.units, \
             "Cannot subtract values with different units"
 
         return _create_units_object(float(self) - float(other), self.units)
 
     @align_arguments
     def __rsub__(self, other):
-        assert self._are_vectors_same(_units_to_vector(self), _units_to_vector(other)), \
-            "Cannot subtract values with different units"
+        assert self.units == _signature_of(other), "Cannot subtract values with different units"
 
         return _create_units_object(float(other) - float(self), self.units)
 
     @align_arguments
     def __pow__(self, power, modulo=None):
         assert isinstance(power, Number) and not isinstance(power, Units), "Raising to the Units object makes no sense"
-        return _create_units_object(float.__pow__(self, power, modulo), {u: power * p for u, p in self.units.items()})
+        return _create_units_object(float.__pow__(self, power, modulo), self.units ** power)
 
     @align_arguments
     def __rpow__(self, power, modulo=None):
         raise AttributeError("Raising to the Units object makes no sense")
 
+    def to(self, to_units: "SingleUnits"):
+        """
+        Reusable converter from the units of this value to to_units, see units.converter.Converter
+        """
+        from units.converter import Converter
+        return Converter(self.units, to_units)
+
     def __rshift__(self, other):
         if isinstance(other, SingleUnits):
             return _convert_unit(self, other)
         else:
             raise "Incorrect argument for right-shift operator. Should be SingleUnit instance"
 
-    @align_arguments
     def __eq__(self, other):
-        return float(self) == float(other)
+        if isinstance(other, Units):
+            state = _active_registry.get()._state
+            _, scaler, units, _ = _base_conversion(self.units, state)
+            _, other_scaler, other_units, _ = _base_conversion(other.units, state)
+            # values of different dimensions are never equal, as their hashes differ
+            return units == other_units and float(self) * scaler == float(other) * other_scaler
+        elif _is_array_like(other):
+            return _array_operation(self, "__eq__", other)
+        elif isinstance(other, Number):
+            # only dimensionless values equal plain numbers, hashes of the others differ
+            _, scaler, units, _ = _base_conversion(self.units, _active_registry.get()._state)
+            return not units and float(self) * scaler == other
+        return float(self) == other
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
 
     @align_arguments
     def __le__(self, other):
@@ -155,32 +365,97 @@ class Units(float):
         return float(self) > float(other)
 
     def __hash__(self):
-        group_to_min_unit = _get_minimum_unit_by_group()
-        converted_value = _convert_unit(self, [group_to_min_unit[unit_to_group[unit]] for unit in self.units])
-        return hash(str(converted_value))
+        _, scaler, _, units_hash = _base_conversion(self.units, _active_registry.get()._state)
+        return hash(float(self) * scaler) ^ units_hash
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """
+        numpy binary operators keep the units, e.g. an array times a value becomes a UnitsArray,
+        every other ufunc works on the plain magnitude like for a float
+        """
+        name = _UFUNC_OPERATORS.get(ufunc.__name__)
+        if name is not None and method == "__call__" and len(inputs) == 2 and not kwargs:
+            left, right = inputs
+            if left is not self:
+                name, right = _REFLECTED_OPERATORS.get(name, "__r" + name[2:]), left
+            operator_method = getattr(self, name, None)
+            return NotImplemented if operator_method is None else operator_method(right)
+        inputs = tuple(float(x) if isinstance(x, Units) else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+
+# numpy ufuncs run as the Units operators of the same name
+_UFUNC_OPERATORS = {
+    "add": "__add__", "subtract": "__sub__", "multiply": "__mul__", "divide": "__truediv__",
+    "true_divide": "__truediv__", "floor_divide": "__floordiv__", "right_shift": "__rshift__",
+    "equal": "__eq__", "not_equal": "__ne__",
+    "less": "__lt__", "less_equal": "__le__", "greater": "__gt__", "greater_equal": "__ge__",
+}
+# operators used when the Units value is the right operand of a ufunc, "__r" + name otherwise
+_REFLECTED_OPERATORS = {
+    "__eq__": "__eq__", "__ne__": "__ne__",
+    "__lt__": "__gt__", "__le__": "__ge__", "__gt__": "__lt__", "__ge__": "__le__",
+}
 
 
 class SingleUnits(Units):
+    """
+    Units with the value 1. Instances are interned, every signature has a single shared SingleUnits object
+    while it is referenced anywhere
+    """
+    __slots__ = ("__weakref__",)
+
+    _interned = WeakValueDictionary()
 
     def __new__(cls, units: dict):
-        return super().__new__(cls, 1, units)
+        signature = Signature(units)
+        obj = SingleUnits._interned.get(signature) if cls is SingleUnits else None
+        if obj is None:
+            obj = super().__new__(cls, 1, signature)
+            obj.units = signature
+            if cls is SingleUnits:
+                SingleUnits._interned[signature] = obj
+        return obj
 
     def __init__(self, units: dict):
-        self.units = units
-        super().__init__(1, units)
+        pass  # units are assigned in __new__, interned instances are not initialized again
 
     def __call__(self, value):
         if isinstance(value, Units):
             return _convert_unit(value, list(self.units.keys()))
+        elif _is_array_like(value):
+            return value >> self
         else:
             return _create_units_object(value, self.units)
 
+    def stream(self, iterable: Iterable, chunk_size: int = None, as_array: bool = False):
+        """
+        Lazy counterpart of `iterable >> self`, see units.stream.iter_convert
+        """
+        from units.stream import iter_convert
+        return iter_convert(iterable, self, chunk_size=chunk_size, as_array=as_array)
+
     def __rrshift__(self, other):
         if isinstance(other, Units):
+            if other.units is self.units:
+                return other
             return _convert_unit(other, self)
         elif isinstance(other, float) or isinstance(other, int):
             return _create_units_object(other, self.units)
+        elif _is_array_like(other):
+            if hasattr(getattr(other, "array", None), "units"):
+                # pandas Series of a units dtype, see units.pandas
+                from units.pandas import convert_series
+                return convert_series(other, self)
+            from units.array import UnitsArray
+            return UnitsArray(other, self.units)
         elif isinstance(other, Iterable):
+            if _is_large_numeric_sequence(other):
+                from units.array import UnitsArray
+                try:
+                    return UnitsArray(other, self.units)
+                except ValueError:
+                    pass  # ragged nesting, fall back to element-wise conversion
             res = []
             for obj in other:
                 res.append(self.__rrshift__(obj))
@@ -189,6 +464,68 @@ class SingleUnits(Units):
             raise "Incorrect argument for right-shift operator. Should be float or Units"
 
 
+def _is_large_numeric_sequence(obj) -> bool:
+    """
+    Whether obj is a long, possibly nested, list or tuple of plain numbers only.
+    Every leaf is checked: a Units item anywhere has to keep its own units through the element-wise conversion
+    """
+    if not _NUMPY_AVAILABLE or not isinstance(obj, (list, tuple)) or len(obj) < ARRAY_CONVERSION_THRESHOLD:
+        return False
+    return _only_plain_numbers(obj)
+
+
+def _only_plain_numbers(obj) -> bool:
+    for item in obj:
+        if isinstance(item, (list, tuple)):
+            if not _only_plain_numbers(item):
+                return False
+        elif isinstance(item, Units) or not isinstance(item, (int, float)):
+            return False
+    return True
+
+
+def _format_value(value: float):
+    return int(value) if value.is_integer() else value
+
+
+def _format_units(units: Signature) -> str:
+    """
+    Unit suffix used by __str__, rendered once per signature
+    """
+    suffix = units._suffix
+    if suffix is None:
+        suffix = units._suffix = _render_units(units)
+    return suffix
+
+
+def _render_units(units: Mapping) -> str:
+    split_units = [[], []]
+    for u in units:
+        if units[u] > 0:
+            split_units[0].append(u)
+        elif units[u] < 0:
+            split_units[1].append(u)
+
+    def _unit_string(unit, power):
+        if power > 1:
+            return f"{unit}^{power}"
+        elif power == 1:
+            return f"{unit}"
+        elif power == 0:
+            return ""
+
+    lines = [
+        "*".join([_unit_string(u, units[u]) for u in split_units[0]]),
+        "*".join([_unit_string(u, -units[u]) for u in split_units[1]])
+    ]
+    if not len(lines[0]) and len(lines[1]):
+        lines[0] = "1"
+    for i, line in enumerate(lines):
+        if len(split_units[i]) > 1:
+            lines[i] = "(" + line + ")"
+    return f"{lines[0]}{'/' if len(lines[1]) else ''}{lines[1]}"
+
+
 def _create_units_object(value: float, units: dict):
     if value == 1:
         return SingleUnits(units)
@@ -197,191 +534,667 @@ def _create_units_object(value: float, units: dict):
 
 
 def __getattr__(name):
-    if name not in globals():
-        return "unit_to_object" in dir and unit_to_object[name]
-    else:
-        raise AttributeError
+    state = _active_registry.get()._state
+    if name in _RegistryState.TABLES:
+        return MappingProxyType(getattr(state, name))
+    elif name in state.unit_to_object:
+        return state.unit_to_object[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _convert_unit(v: Units, to_units: Union[str, List[str], Units]):
+    if isinstance(to_units, List):
+        key = tuple(to_units)
+    elif isinstance(to_units, str):
+        key = (to_units,)
+    elif isinstance(to_units, SingleUnits):
+        key = to_units.units
+        if key is v.units:
+            return v
+    else:
+        raise ValueError(f"Incorrect to_units type {type(to_units)}")
+
+    state = _active_registry.get()._state
+    plan = state.conversion_cache.get((v.units, key))
+    if plan is None:
+        plan = _conversion_plan(v.units, to_units, state)
+        state.conversion_cache.put((v.units, key), plan)
+    return _apply_conversion(v, plan)
+
+
+def _conversion_plan(units: Signature, to_units: Union[str, List[str], Units], state: "_RegistryState"):
+    """
+    Validate the conversion and precompute it as (scaler, target signature) or IDENTITY_CONVERSION
+    """
+    unit_to_group = state.unit_to_group
     if isinstance(to_units, List):
         pass
     elif isinstance(to_units, str):
-        assert len(v.units) == 1, "cannot convert multi-unit object to the single unit"
+        assert len(units) == 1, "cannot convert multi-unit object to the single unit"
         to_units = [to_units]
     elif isinstance(to_units, SingleUnits):
-        assert all([unit_to_group[u1] == unit_to_group[u2] for u1, u2 in zip(v.units, to_units.units)]), \
-            "Cannot perform conversion between different unit groups"
-        assert all([v.units[u1] == to_units.units[u2] for u1, u2 in zip(v.units, to_units.units)]), \
+        if state.unit_to_definition and _has_derived_units(state, units, to_units.units):
+            return _dimensional_conversion_plan(units, to_units.units, state)
+        # units are matched by group, signatures may list them in a different order, e.g. when parsed
+        targets = {unit_to_group[unit]: unit for unit in to_units.units}
+        assert len(targets) == len(to_units.units) == len(units) and \
+            all([unit_to_group[u] in targets for u in units]), "Cannot perform conversion between different unit groups"
+        assert all([units[u] == to_units.units[targets[unit_to_group[u]]] for u in units]), \
             "Cannot perform conversion between units raised to different power"
-        to_units = list(to_units.units.keys())
-    else:
-        raise ValueError(f"Incorrect to_units type {type(to_units)}")
+        to_units = [targets[unit_to_group[u]] for u in units]
 
-    assert len(v.units) == len(to_units), "to_units length should match the value units length"
-    if all([u1 == u2 for u1, u2 in zip(v.units.keys(), to_units)]):
-        return v
+    assert len(units) == len(to_units), "to_units length should match the value units length"
+    if all([u1 == u2 for u1, u2 in zip(units.keys(), to_units)]):
+        return IDENTITY_CONVERSION
 
-    from_units = list(v.units.keys())
+    from_units = list(units.keys())
 
     multipliers = []
     for i, (from_unit, to_unit) in enumerate(zip(from_units, to_units)):
         assert unit_to_group[from_unit] == unit_to_group[to_unit], \
             "Cannot perform conversion between units from different groups"
-        assert v.units[from_unit]
+        assert units[from_unit]
 
-        fraction = unit_to_weight[from_unit] / unit_to_weight[to_unit]
-        multipliers.append(fraction)
+        multipliers.append(state.group_tables[unit_to_group[from_unit]].factor(from_unit, to_unit))
     scaler = 1
-    for multiplier, power in zip(multipliers, v.units.values()):
+    for multiplier, power in zip(multipliers, units.values()):
         scaler *= multiplier ** power
-    return _create_units_object(v.value * scaler, {unit: power for unit, power in zip(to_units, v.units.values())})
+    return scaler, Signature({unit: power for unit, power in zip(to_units, units.values())})
+
 
+def _has_derived_units(state: "_RegistryState", *signatures: Signature) -> bool:
+    return any(unit in state.unit_to_definition for units in signatures for unit in units)
 
-def _units_to_vector(v: Union[Units, Number], inverse=False) -> List:
-    unit_names = list(unit_to_weight.keys())
-    vector = [0] * len(unit_names)
-    if not isinstance(v, Units):
-        return vector
-    for i, unit in enumerate(unit_names):
-        if unit in v.units:
-            vector[i] = v.units[unit] if not inverse else -v.units[unit]
-    return vector
 
+def _dimensional_conversion_plan(units: Signature, to_units: Signature, state: "_RegistryState"):
+    """
+    Conversion through the base units, used when derived units are involved, e.g. from N to kg*m/sec^2
+    """
+    _, scaler, base_units, _ = _base_conversion(units, state)
+    _, to_scaler, to_base_units, _ = _base_conversion(to_units, state)
+    assert base_units == to_base_units, "Cannot perform conversion between different unit groups"
+    if units == to_units:
+        return IDENTITY_CONVERSION
+    return scaler / to_scaler, to_units
 
-def _vecto_to_units(vector) -> dict:
-    unit_names = list(unit_to_weight.keys())
-    res = {}
-    for i, v in enumerate(vector):
-        if v != 0:
-            res[unit_names[i]] = v
-    return res
+
+def _apply_conversion(v: Units, plan):
+    if plan is IDENTITY_CONVERSION:
+        return v
+    scaler, units = plan
+    return _create_units_object(float(v) * scaler, units)
 
 
 def _align_units(*args):
+    state = _active_registry.get()._state
+    key = tuple(a.units if isinstance(a, Units) else None for a in args)
+    plans = state.alignment_cache.get(key)
+    if plans is None:
+        plans = _alignment_plans(key, state)
+        state.alignment_cache.put(key, plans)
+    return [a if plan is None else _apply_conversion(a, plan) for a, plan in zip(args, plans)]
+
+
+def _dispatch_plan(func, self: "Units", other: Number, state: "_RegistryState") -> tuple:
+    """
+    (scaler of self, scaler of other, result signature or None for comparisons) of an aligned binary operator.
+    The operator itself is run once on the aligned operands to validate their units and get the result units
+    """
+    key = (self.units, other.units if isinstance(other, Units) else None)
+    plans = state.alignment_cache.get(key)
+    if plans is None:
+        plans = _alignment_plans(key, state)
+        state.alignment_cache.put(key, plans)
+    aligned = [a if plan is None else _apply_conversion(a, plan) for a, plan in zip((self, other), plans)]
+    res = func(*aligned)
+    scalers = [1 if plan is None or plan is IDENTITY_CONVERSION else plan[0] for plan in plans]
+    return scalers[0], scalers[1], res.units if isinstance(res, Units) else None
+
+
+def _alignment_plans(signatures, state: "_RegistryState") -> tuple:
+    """
+    Conversion plans that bring every signature to the smallest unit of each group present in any of them.
+    Operands involving derived units are brought to the base units they stand for, like by __eq__ and __hash__
+    """
+    present = [units for units in signatures if units is not None]
+    if state.unit_to_definition and len(set(present)) > 1 and _has_derived_units(state, *present):
+        return tuple(None if units is None else _base_plan(units, state) for units in signatures)
+    unit_to_group, unit_to_weight = state.unit_to_group, state.unit_to_weight
     min_units_per_group = {}
 
-    for a in args:
-        if not isinstance(a, Units):
+    for units in signatures:
+        if units is None:
             continue
-        for unit, power in a.units.items():
+        for unit, power in units.items():
             group = unit_to_group[unit]
             if group not in min_units_per_group:
                 min_units_per_group[group] = unit
             elif unit_to_weight[unit] < unit_to_weight[min_units_per_group[group]]:
                 min_units_per_group[group] = unit
 
-    new_args = []
-    for a in args:
-        if not isinstance(a, Units):
-            new_args.append(a)
+    plans = []
+    for units in signatures:
+        if units is None:
+            plans.append(None)
         else:
             to_units = []
-            for unit in a.units:
+            for unit in units:
                 group = unit_to_group[unit]
                 min_group_unit = min_units_per_group[group]
                 to_units.append(min_group_unit)
-            res = _convert_unit(a, to_units)
-            new_args.append(res)
-    return new_args
+            plans.append(_conversion_plan(units, to_units, state))
+    return tuple(plans)
+
+
+def _base_plan(units: Signature, state: "_RegistryState"):
+    _, scaler, base_units, _ = _base_conversion(units, state)
+    return IDENTITY_CONVERSION if scaler == 1 and base_units == units else (scaler, base_units)
+
+
+def _base_conversion(units: Signature, state: "_RegistryState"):
+    """
+    (state, scaler, signature, signature hash) bringing the units to the base (smallest) unit of their groups.
+    The result is cached on the signature for the registry state it was computed with.
+    Dimensionless signatures hash to 0, so their values hash the same as plain numbers.
+    """
+    base = units._base
+    if base is not None and base[0] is state:
+        return base
+    if state.unit_to_definition and _has_derived_units(state, units):
+        scaler, base_units = 1, EMPTY_SIGNATURE
+        for unit, power in units.items():
+            if unit in state.unit_to_definition:
+                factor, definition = state.unit_to_definition[unit]
+                _, unit_scaler, unit_base, _ = _base_conversion(definition, state)
+                unit_scaler *= factor
+            else:
+                _, unit_scaler, unit_base, _ = _base_conversion(Signature({unit: 1}), state)
+            scaler *= unit_scaler ** power
+            base_units = base_units * unit_base ** power
+    else:
+        plan = _conversion_plan(units, [state.group_to_base_unit[state.unit_to_group[unit]] for unit in units], state)
+        scaler, base_units = (1, units) if plan is IDENTITY_CONVERSION else plan
+    units._base = (state, scaler, base_units, hash(base_units) if len(base_units) else 0)
+    return units._base
+
+
+class _SharedMap(MutableMapping):
+    """
+    Insertion-ordered mapping used for the registry tables.
+    Entries are spread over 32 x 32 buckets by key hash. copy() shares every bucket with the source
+    and a bucket is copied on the first write to it, so updating a copied table costs
+    about the same whether ten or ten thousand units are registered
+    """
+    __slots__ = ("_root", "_len", "_counter", "_owned")
+
+    def __init__(self, items=()):
+        self._root = [None] * _SHARED_MAP_FANOUT
+        self._len = 0
+        self._counter = 0
+        # ids of the nodes created by this map, the only ones written in place
+        self._owned = {id(self._root)}
+        self.update(items)
+
+    def copy(self) -> "_SharedMap":
+        res = _SharedMap.__new__(_SharedMap)
+        res._root, res._len, res._counter, res._owned = self._root, self._len, self._counter, set()
+        self._owned = set()  # the nodes are shared now, both maps copy them before writing
+        return res
+
+    def _leaf(self, key) -> Union[None, dict]:
+        h = hash(key)
+        node = self._root[h & _SHARED_MAP_MASK]
+        return None if node is None else node[(h >> _SHARED_MAP_BITS) & _SHARED_MAP_MASK]
+
+    def _writable_leaf(self, key) -> dict:
+        h = hash(key)
+        owned = self._owned
+        if id(self._root) not in owned:
+            self._root = list(self._root)
+            owned.add(id(self._root))
+        i, j = h & _SHARED_MAP_MASK, (h >> _SHARED_MAP_BITS) & _SHARED_MAP_MASK
+        node = self._root[i]
+        if node is None or id(node) not in owned:
+            node = self._root[i] = [None] * _SHARED_MAP_FANOUT if node is None else list(node)
+            owned.add(id(node))
+        leaf = node[j]
+        if leaf is None or id(leaf) not in owned:
+            leaf = node[j] = {} if leaf is None else dict(leaf)
+            owned.add(id(leaf))
+        return leaf
+
+    def __getitem__(self, key):
+        leaf = self._leaf(key)
+        if leaf is None:
+            raise KeyError(key)
+        return leaf[key][1]
+
+    def get(self, key, default=None):
+        leaf = self._leaf(key)
+        entry = None if leaf is None else leaf.get(key)
+        return default if entry is None else entry[1]
+
+    def __contains__(self, key):
+        leaf = self._leaf(key)
+        return leaf is not None and key in leaf
+
+    def __setitem__(self, key, value):
+        leaf = self._writable_leaf(key)
+        entry = leaf.get(key)
+        if entry is None:
+            entry = (self._counter,)
+            self._counter += 1
+            self._len += 1
+        leaf[key] = (entry[0], value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        del self._writable_leaf(key)[key]
+        self._len -= 1
+
+    def __iter__(self):
+        # entries are ordered by their insertion counter
+        entries = sorted((entry[0], key) for node in self._root if node is not None
+                         for leaf in node if leaf for key, entry in leaf.items())
+        return iter([key for _, key in entries])
+
+    def __len__(self):
+        return self._len
 
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)})"
+
+
+_SHARED_MAP_BITS = 5
+_SHARED_MAP_FANOUT = 1 << _SHARED_MAP_BITS
+_SHARED_MAP_MASK = _SHARED_MAP_FANOUT - 1
+
+
+class _RegistryState:
+    """
+    Snapshot of the registry tables together with the caches built from them.
+    A published snapshot is never modified, updates are applied to a copy which then replaces it.
+    """
+    TABLES = ("unit_to_weight", "unit_to_group", "unit_to_object", "group_to_units", "group_to_base_unit",
+              "unit_to_definition")
+    __slots__ = TABLES + ("group_tables", "conversion_cache", "alignment_cache", "dispatch_cache")
+
+    def __init__(self, source: "_RegistryState" = None):
+        # the tables of a copy share their storage with the source, an update only copies the buckets it touches
+        self.unit_to_weight = source.unit_to_weight.copy() if source else _SharedMap()
+        self.unit_to_group = source.unit_to_group.copy() if source else _SharedMap()
+        self.unit_to_object = source.unit_to_object.copy() if source else _SharedMap()
+        # group -> tuple of its units in registration order
+        self.group_to_units = source.group_to_units.copy() if source else _SharedMap()
+        self.group_to_base_unit = source.group_to_base_unit.copy() if source else _SharedMap()
+        # derived unit -> (factor, signature it stands for), e.g. kph -> (1, km/hr)
+        self.unit_to_definition = source.unit_to_definition.copy() if source else _SharedMap()
+        self.group_tables = source.group_tables.copy() if source else _SharedMap()
+        self.conversion_cache = _BoundedCache(CONVERSION_CACHE_SIZE)
+        self.alignment_cache = _BoundedCache(CONVERSION_CACHE_SIZE)
+        self.dispatch_cache = _BoundedCache(CONVERSION_CACHE_SIZE)
+
+    def add_group(self, group_name: str, unit_to_weight_map: dict, weight_type: str, objects: dict = None) -> dict:
+        """
+        objects: already created SingleUnits to register instead of new ones, see UnitRegistry.create_groups(lazy=True)
+        """
+        unit_to_weight_map = _absolute_weights(unit_to_weight_map, weight_type)
+
+        res = {}
+        for unit_name, weight in unit_to_weight_map.items():
+            self.unit_to_group[unit_name] = group_name
+            self.unit_to_weight[unit_name] = weight
+            if unit_name not in _unit_order:
+                _unit_order[unit_name] = next(_unit_counter)
+            obj = objects[unit_name] if objects is not None else SingleUnits({unit_name: 1})
+            self.unit_to_object[unit_name] = obj
+            res[unit_name] = obj
+        # the table of the group is extended, so adding units one by one to a large group stays cheap
+        table = self.group_tables.get(group_name, _EMPTY_TABLE).updated(unit_to_weight_map)
+        self.group_tables[group_name] = table
+        self.group_to_units[group_name] = table.units
+
+        base_unit = self.group_to_base_unit.get(group_name)
+        if base_unit is None or base_unit in unit_to_weight_map:
+            weights = table.weights
+            base_unit = table.units[min(range(len(weights)), key=weights.__getitem__)]
+        else:
+            for unit in unit_to_weight_map:
+                if self.unit_to_weight[unit] < self.unit_to_weight[base_unit]:
+                    base_unit = unit
+        self.group_to_base_unit[group_name] = base_unit
+        return res
+
+    def add_definitions(self, group_name: Union[None, str], definitions: Dict[str, Units]) -> dict:
+        """
+        Register derived units standing for the given combinations of registered units.
+        Without group_name every derived unit gets a group of its own
+        """
+        res = {}
+        for unit_name, value in definitions.items():
+            assert isinstance(value, Units), "Derived unit should be defined by Units value, e.g. N=kg*m/sec**2"
+            for unit in value.units:
+                assert unit in self.unit_to_group, f"Unknown unit {unit!r} in the definition of {unit_name!r}"
+            self.unit_to_definition[unit_name] = (float(value), value.units)
+            _, scaler, base_units, _ = _base_conversion(Signature({unit_name: 1}), self)
+            group = group_name if group_name is not None else unit_name
+            if group in self.group_to_units:
+                _, _, group_base_units, _ = _base_conversion(Signature({self.group_to_units[group][0]: 1}), self)
+                assert group_base_units == base_units, "Units of one group should have the same dimension"
+            res.update(self.add_group(group, {unit_name: scaler}, "abs"))
+        return res
+
+    def remove_group(self, group_name: str):
+        for name in self.group_to_units[group_name]:
+            del self.unit_to_object[name]
+            del self.unit_to_weight[name]
+            del self.unit_to_group[name]
+            self.unit_to_definition.pop(name, None)
+        del self.group_to_units[group_name]
+        del self.group_to_base_unit[group_name]
+        del self.group_tables[group_name]
+
+
+class ConversionTable:
+    """
+    Conversion factors between the units of one group, weights[i] is the absolute weight of units[i].
+    factor() divides two weights, the contiguous columns of factors_to(), usable for bulk conversion
+    of mixed-unit columns, are built on first use
+    """
+    __slots__ = ("units", "index", "weights", "_columns")
+
+    def __init__(self, units: Iterable[str] = (), weights: Iterable[Number] = ()):
+        self.units = tuple(units)
+        self.index = {unit: i for i, unit in enumerate(self.units)}
+        self.weights = _array("d", weights)
+        self._columns = {}
 
-def _get_minimum_unit_by_group():
-    min_units_per_group = {}
-    for unit in unit_to_group:
-        group = unit_to_group[unit]
-        if group not in min_units_per_group:
-            min_units_per_group[group] = unit
-        elif unit_to_weight[unit] < unit_to_weight[min_units_per_group[group]]:
-            min_units_per_group[group] = unit
-    return min_units_per_group
+    def __repr__(self):
+        return f"ConversionTable({list(self.units)})"
+
+    def updated(self, unit_to_weight: Dict[str, Number]) -> "ConversionTable":
+        """
+        Copy of the table with the given units added or re-weighted
+        """
+        units, index, weights = list(self.units), dict(self.index), _array("d", self.weights)
+        for unit, weight in unit_to_weight.items():
+            i = index.get(unit)
+            if i is None:
+                index[unit] = len(units)
+                units.append(unit)
+                weights.append(weight)
+            else:
+                weights[i] = weight
+        res = ConversionTable.__new__(ConversionTable)
+        res.units, res.index, res.weights, res._columns = tuple(units), index, weights, {}
+        return res
+
+    def factor(self, from_unit: str, to_unit: str) -> float:
+        return self.weights[self.index[from_unit]] / self.weights[self.index[to_unit]]
+
+    def factors_to(self, to_unit: str) -> memoryview:
+        """
+        Factors converting every unit of the group to to_unit, in the order of units
+        """
+        column = self._columns.get(to_unit)
+        if column is None:
+            to_weight = self.weights[self.index[to_unit]]
+            column = self._columns[to_unit] = _array("d", (weight / to_weight for weight in self.weights))
+        return memoryview(column)
+
+
+_EMPTY_TABLE = ConversionTable()
+
+
+def _absolute_weights(unit_to_weight_map: dict, weight_type: str) -> dict:
+    if weight_type != "rel":
+        return unit_to_weight_map
+    new_map = {}
+    prev_value = 1
+    for k, v in unit_to_weight_map.items():
+        prev_value = new_map[k] = v * prev_value
+    return new_map
+
+
+@lru_cache(maxsize=1024)
+def _units_pack_type(unit_names: tuple) -> type:
+    # building a namedtuple class is far more expensive than registering its units
+    return namedtuple("UnitsPack", unit_names)
+
+
+SNAPSHOT_VERSION = 1
+
+
+class UnitRegistry:
+    """
+    Independent catalog of unit groups.
+    Conversions read the current snapshot of the registry without locking,
+    while updates are serialized, applied to a copy and published atomically.
+
+    Groups created with lazy=True are only recorded; they are registered in one batch
+    the first time the registry snapshot is read.
+    """
+
+    def __init__(self):
+        self._state = self._materialized = _RegistryState()
+        self._pending = []
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        # only reached when _state was dropped by a lazy create_groups call
+        if name != "_state":
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        with self._lock:
+            if "_state" not in self.__dict__:
+                state = self._materialized
+                if self._pending:
+                    state = _RegistryState(state)
+                    for group_name, unit_to_weight_map, objects in self._pending:
+                        state.add_group(group_name, unit_to_weight_map, "abs", objects)
+                    self._pending.clear()
+                self._publish(state)
+            return self.__dict__["_state"]
+
+    def _publish(self, state: "_RegistryState"):
+        self._state = self._materialized = state
+
+    def copy(self) -> "UnitRegistry":
+        registry = UnitRegistry()
+        registry._publish(self._state)
+        return registry
+
+    def create_units(self, *, group_name: str = "common", weight_type="rel", lazy: bool = False,
+                     **unit_to_weight_map) -> NamedTuple:
+        return self.create_groups({group_name: unit_to_weight_map}, weight_type=weight_type, lazy=lazy)[group_name]
+
+    def create_groups(self, groups: Dict[str, Dict[str, Number]], weight_type="rel",
+                      lazy: bool = False) -> Dict[str, NamedTuple]:
+        """
+        Register several groups at once. Readers see either none or all of them.
+        With lazy=True the groups are registered on the first use of the registry,
+        so declaring many groups at startup costs a single registry update
+        """
+        for unit_to_weight_map in groups.values():
+            assert all([isinstance(v, Number) for _, v in unit_to_weight_map.items()]), \
+                "unit_to_weight_map should consist of unit name and it's weight"
+        res = {}
+        with self._lock:
+            if lazy:
+                for group_name, unit_to_weight_map in groups.items():
+                    units = res[group_name] = {unit: SingleUnits({unit: 1}) for unit in unit_to_weight_map}
+                    self._pending.append((group_name, _absolute_weights(unit_to_weight_map, weight_type), units))
+                self.__dict__.pop("_state", None)
+            else:
+                state = _RegistryState(self._state)
+                for group_name, unit_to_weight_map in groups.items():
+                    res[group_name] = state.add_group(group_name, unit_to_weight_map, weight_type)
+                self._publish(state)
+        return {group_name: _units_pack_type(tuple(units))(**units) for group_name, units in res.items()}
+
+    def define_units(self, *, group_name: str = None, **definitions: Units) -> NamedTuple:
+        """
+        Register derived units, e.g. define_units(N=kg*m/sec**2, kph=km/hr).
+        They are converted with `>>` to and from any units of the same dimension
+        """
+        with self._lock:
+            state = _RegistryState(self._state)
+            res = state.add_definitions(group_name, definitions)
+            self._publish(state)
+        return _units_pack_type(tuple(res))(**res)
+
+    def conversion_table(self, group_name: str) -> ConversionTable:
+        return self._state.group_tables[group_name]
+
+    def load_units(self, *unit_names, group_name: str = None,
+                   except_group_names: Union[None, str, List[str]] = None) -> NamedTuple:
+        state = self._state
+        res = OrderedDict()
+
+        if group_name is not None:
+            if group_name in state.group_to_units:
+                res.update({unit: state.unit_to_object[unit] for unit in state.group_to_units[group_name]})
+            else:
+                return None
+        if except_group_names is not None and isinstance(except_group_names, str):
+            except_group_names = [except_group_names]
+        if len(unit_names) == 0 and group_name is None:
+            name_list = state.unit_to_object.keys()
+        else:
+            name_list = unit_names
+        for name in name_list:
+            if except_group_names is None or state.unit_to_group[name] not in except_group_names:
+                res[name] = state.unit_to_object[name]
+        if len(res) == 0:
+            return None
+        elif len(res) == 1:
+            return next(iter(res.values()))
+        else:
+            return _units_pack_type(tuple(res))(**res)
+
+    def destroy_units(self, group_name: str = None,
+                      except_group_names: Union[None, str, List[str]] = PREDEFINED_GROUP_LIST):
+        if except_group_names is not None and isinstance(except_group_names, str):
+            except_group_names = [except_group_names]
+        if group_name is not None:
+            if except_group_names is not None and group_name in except_group_names:
+                raise AttributeError("Cannot destroy group from the except_group_names list")
+        with self._lock:
+            state = _RegistryState(self._state)
+            groups_names = [group_name] if group_name is not None else list(state.group_to_units)
+            for group_name in groups_names:
+                if except_group_names is not None and group_name in except_group_names:
+                    continue
+                if group_name in state.group_to_units:
+                    state.remove_group(group_name)
+            self._publish(state)
+
+    def save_snapshot(self, path: str):
+        """
+        Write all groups with their absolute weights in registration order, see load_snapshot
+        """
+        state = self._state
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "groups": {group: {unit: state.unit_to_weight[unit] for unit in units}
+                       for group, units in state.group_to_units.items()},
+            "order": sorted(state.unit_to_weight, key=_unit_order.__getitem__),
+            "definitions": {unit: [factor, list(definition.items())]
+                            for unit, (factor, definition) in state.unit_to_definition.items()},
+        }
+        with open(path, "w") as f:
+            json.dump(snapshot, f)
+
+    def load_snapshot(self, path: str):
+        """
+        Replace the content of the registry with a snapshot written by save_snapshot in a single update
+        """
+        with open(path) as f:
+            snapshot = json.load(f)
+        if snapshot["version"] > SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported registry snapshot version {snapshot['version']}")
+        for unit_name in snapshot["order"]:
+            if unit_name not in _unit_order:
+                _unit_order[unit_name] = next(_unit_counter)
+        state = _RegistryState()
+        for group_name, unit_to_weight_map in snapshot["groups"].items():
+            state.add_group(group_name, unit_to_weight_map, "abs")
+        for unit_name, (factor, definition) in snapshot.get("definitions", {}).items():
+            state.unit_to_definition[unit_name] = (factor, Signature(tuple(item) for item in definition))
+        with self._lock:
+            self._pending.clear()
+            self._publish(state)
+
+    def conversion_cache_info(self) -> dict:
+        """
+        Hit/miss statistics of the unit conversion, alignment and operator dispatch caches
+        of the current registry snapshot
+        """
+        state = self._state
+        return {"conversion": state.conversion_cache.info(), "alignment": state.alignment_cache.info(),
+                "dispatch": state.dispatch_cache.info()}
+
+    def clear_conversion_cache(self):
+        state = self._state
+        state.conversion_cache.clear()
+        state.alignment_cache.clear()
+        state.dispatch_cache.clear()
+
+
+DEFAULT_REGISTRY = UnitRegistry()
+
+_active_registry: ContextVar = ContextVar("active_unit_registry", default=DEFAULT_REGISTRY)
 
 
 ####################
 ## Public API
 ####################
 
-def create_units(*, group_name: str = "common", weight_type="rel", **unit_to_weight_map) -> NamedTuple:
-    assert all([isinstance(v, Number) for _, v in unit_to_weight_map.items()]), \
-        "unit_to_weight_map should consist of unit name and it's weight"
-    if "unit_to_weight" not in globals():
-        global unit_to_weight
-        unit_to_weight = OrderedDict()
-    if "unit_to_group" not in globals():
-        global unit_to_group
-        unit_to_group = OrderedDict()
-    if "unit_to_object" not in globals():
-        global unit_to_object
-        unit_to_object = OrderedDict()
-    if "group_to_units" not in globals():
-        global group_to_units
-        group_to_units = OrderedDict()
-
-    if weight_type == "rel":
-        new_map = {}
-        prev_value = 1
-        for k, v in unit_to_weight_map.items():
-            prev_value = new_map[k] = v * prev_value
-        unit_to_weight_map = new_map
-
-    res = {}
-    for unit_name, weight in unit_to_weight_map.items():
-        if group_name in group_to_units:
-            group_to_units[group_name].append(unit_name)
-        else:
-            group_to_units[group_name] = [unit_name]
-        unit_to_group[unit_name] = group_name
-        unit_to_weight[unit_name] = weight
-        obj = SingleUnits({unit_name: 1})
-        unit_to_object[unit_name] = obj
-        res[unit_name] = obj
-    UnitsPack = namedtuple("UnitsPack", " ".join(res.keys()))
-    return UnitsPack(**res)
+def get_registry() -> UnitRegistry:
+    """
+    Registry used by the current thread or asyncio task, DEFAULT_REGISTRY unless changed with use_registry
+    """
+    return _active_registry.get()
 
 
-def load_units(*unit_names, group_name: str = None, except_group_names: Union[None, str, List[str]] = None) -> NamedTuple:
-    res = OrderedDict()
+@contextmanager
+def use_registry(registry: UnitRegistry):
+    token = _active_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _active_registry.reset(token)
 
-    if group_name is not None:
-        if "group_to_units" in globals() and group_to_units is not None and group_name in group_to_units:
-            res.update({unit: unit_to_object[unit] for unit in group_to_units[group_name]})
-        else:
-            return None
-    if except_group_names is not None and isinstance(except_group_names, str):
-        except_group_names = [except_group_names]
-    if len(unit_names) == 0 and group_name is None:
-        name_list = unit_to_object.keys()
-    else:
-        name_list = unit_names
-    for name in name_list:
-        if except_group_names is None or unit_to_group[name] not in except_group_names:
-            res[name] = unit_to_object[name]
-    if len(res) == 0:
-        return None
-    elif len(res) == 1:
-        return next(iter(res.values()))
-    else:
-        UnitsPack = namedtuple("UnitsPack", " ".join(res.keys()))
-        return UnitsPack(**res)
+
+def create_units(*, group_name: str = "common", weight_type="rel", lazy: bool = False,
+                 **unit_to_weight_map) -> NamedTuple:
+    return get_registry().create_units(group_name=group_name, weight_type=weight_type, lazy=lazy,
+                                       **unit_to_weight_map)
+
+
+def create_groups(groups: Dict[str, Dict[str, Number]], weight_type="rel", lazy: bool = False) -> Dict[str, NamedTuple]:
+    return get_registry().create_groups(groups, weight_type=weight_type, lazy=lazy)
+
+
+def define_units(*, group_name: str = None, **definitions: Units) -> NamedTuple:
+    return get_registry().define_units(group_name=group_name, **definitions)
+
+
+def conversion_table(group_name: str) -> ConversionTable:
+    return get_registry().conversion_table(group_name)
+
+
+def conversion_cache_info() -> dict:
+    return get_registry().conversion_cache_info()
+
+
+def clear_conversion_cache():
+    get_registry().clear_conversion_cache()
+
+
+def load_units(*unit_names, group_name: str = None, except_group_names: Union[None, str, List[str]] = None) -> NamedTuple:
+    return get_registry().load_units(*unit_names, group_name=group_name, except_group_names=except_group_names)
 
 
 def destroy_units(group_name: str = None, except_group_names: Union[None, str, List[str]] = PREDEFINED_GROUP_LIST):
-    if except_group_names is not None and isinstance(except_group_names, str):
-        except_group_names = [except_group_names]
-    if "unit_to_group" not in globals():
-        return  # nothing to clear. No units yet
-    if group_name is not None:
-        if except_group_names is not None and group_name in except_group_names:
-            raise AttributeError("Cannot destroy group from the except_group_names list")
-        groups_names = [group_name]
-    else:
-        groups_names = list(set(unit_to_group.values()))
-    for group_name in groups_names:
-        if except_group_names is not None and group_name in except_group_names:
-            continue
-        if group_name in group_to_units:
-            for name in group_to_units[group_name]:
-                del unit_to_object[name]
-                del unit_to_weight[name]
-                del unit_to_group[name]
-            del group_to_units[group_name]
+    get_registry().destroy_units(group_name, except_group_names=except_group_names)
@@ -0,0 +1,206 @@
+from numbers import Number
+
+import numpy as np
+
+import units
+from units import Units, SingleUnits, Signature, _create_units_object, _format_units
+
+
+class UnitsArray:
+    """
+    Array of magnitudes sharing a single unit signature.
+    Every operation aligns the unit signatures once and then runs on the whole ndarray at once.
+    """
+    # make numpy arrays defer to our reflected operators
+    __array_ufunc__ = None
+    __hash__ = None
+
+    def __init__(self, value, units: dict):
+        self.value: np.ndarray = np.asarray(value, dtype=float)
+        self.units: Signature = Signature(units)
+
+    @property
+    def unit(self) -> SingleUnits:
+        return SingleUnits(self.units)
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    @property
+    def size(self):
+        return self.value.size
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, item):
+        return self._wrap(self.value[item], self.units)
+
+    def __iter__(self):
+        for v in self.value:
+            yield self._wrap(v, self.units)
+
+    def tolist(self) -> list:
+        return _to_units_list(self.value.tolist(), self.units)
+
+    def __str__(self):
+        return f"{np.array2string(self.value, separator=', ')} {_format_units(self.units)}"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @staticmethod
+    def _wrap(value, units: dict):
+        if np.ndim(value) == 0:
+            return _create_units_object(float(value), units)
+        return UnitsArray(value, units)
+
+    @staticmethod
+    def _operand(other):
+        """
+        Split other operand into (magnitudes, unit) where unit is None for plain numbers and arrays
+        """
+        if isinstance(other, UnitsArray):
+            return other.value, other.unit
+        elif isinstance(other, Units):
+            return float(other), SingleUnits(other.units)
+        elif isinstance(other, Number) or isinstance(other, np.ndarray):
+            return other, None
+        elif isinstance(other, (list, tuple)):
+            return np.asarray(other, dtype=float), None
+        raise TypeError(f"Unsupported operand type {type(other)}")
+
+    def _aligned(self, other):
+        """
+        Align both unit signatures once and return the scaled magnitudes with the aligned units
+        """
+        other_value, other_unit = self._operand(other)
+        if other_unit is None:
+            return self.value, other_value, self.units, None
+        # through the module, so units.profiling sees the call
+        aligned_self, aligned_other = units._align_units(self.unit, other_unit)
+        return self.value * float(aligned_self), other_value * float(aligned_other), \
+            aligned_self.units, aligned_other.units
+
+    @staticmethod
+    def _check_same_units(self_units, other_units, message):
+        assert other_units is None or self_units == other_units, message
+
+    def _product(self, other, inverse_self=False, inverse_other=False):
+        other_value, other_unit = self._operand(other)
+        self_unit = self.unit ** -1 if inverse_self else self.unit
+        if other_unit is None:
+            return self_unit, other_value, 1.0
+        other_unit = other_unit ** -1 if inverse_other else other_unit
+        product = self_unit * other_unit
+        return product, other_value, float(product)
+
+    def __mul__(self, other):
+        product, other_value, scaler = self._product(other)
+        return UnitsArray(self.value * other_value * scaler, product.units)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        product, other_value, scaler = self._product(other, inverse_other=True)
+        return UnitsArray(self.value / other_value * scaler, product.units)
+
+    def __rtruediv__(self, other):
+        product, other_value, scaler = self._product(other, inverse_self=True)
+        return UnitsArray(other_value / self.value * scaler, product.units)
+
+    def __floordiv__(self, other):
+        product, other_value, scaler = self._product(other, inverse_other=True)
+        return UnitsArray(np.floor(self.value / other_value * scaler), product.units)
+
+    def __rfloordiv__(self, other):
+        product, other_value, scaler = self._product(other, inverse_self=True)
+        return UnitsArray(np.floor(other_value / self.value * scaler), product.units)
+
+    def __add__(self, other):
+        self_value, other_value, self_units, other_units = self._aligned(other)
+        self._check_same_units(self_units, other_units, "Cannot add values with different units")
+        return UnitsArray(self_value + other_value, self_units)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        self_value, other_value, self_units, other_units = self._aligned(other)
+        self._check_same_units(self_units, other_units, "Cannot subtract values with different units")
+        return UnitsArray(self_value - other_value, self_units)
+
+    def __rsub__(self, other):
+        self_value, other_value, self_units, other_units = self._aligned(other)
+        self._check_same_units(self_units, other_units, "Cannot subtract values with different units")
+        return UnitsArray(other_value - self_value, self_units)
+
+    def __neg__(self):
+        return UnitsArray(-self.value, self.units)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return UnitsArray(np.abs(self.value), self.units)
+
+    def __pow__(self, power, modulo=None):
+        assert isinstance(power, Number) and not isinstance(power, Units), "Raising to the Units object makes no sense"
+        return UnitsArray(self.value ** power, (self.unit ** power).units)
+
+    def __rpow__(self, power, modulo=None):
+        raise AttributeError("Raising to the Units object makes no sense")
+
+    def __rshift__(self, other):
+        if isinstance(other, SingleUnits):
+            converted = units._convert_unit(self.unit, other)
+            return UnitsArray(self.value * float(converted), converted.units)
+        else:
+            raise TypeError("Incorrect argument for right-shift operator. Should be SingleUnit instance")
+
+    def _compare(self, other, op):
+        self_value, other_value, self_units, other_units = self._aligned(other)
+        self._check_same_units(self_units, other_units, "Cannot compare values with different units")
+        return op(self_value, other_value)
+
+    def __eq__(self, other):
+        return self._compare(other, np.equal)
+
+    def __ne__(self, other):
+        return self._compare(other, np.not_equal)
+
+    def __le__(self, other):
+        return self._compare(other, np.less_equal)
+
+    def __lt__(self, other):
+        return self._compare(other, np.less)
+
+    def __ge__(self, other):
+        return self._compare(other, np.greater_equal)
+
+    def __gt__(self, other):
+        return self._compare(other, np.greater)
+
+    def sum(self, axis=None):
+        return self._wrap(self.value.sum(axis=axis), self.units)
+
+    def mean(self, axis=None):
+        return self._wrap(self.value.mean(axis=axis), self.units)
+
+    def min(self, axis=None):
+        return self._wrap(self.value.min(axis=axis), self.units)
+
+    def max(self, axis=None):
+        return self._wrap(self.value.max(axis=axis), self.units)
+
+
+def _to_units_list(values, units: dict):
+    if isinstance(values, list):
+        return [_to_units_list(v, units) for v in values]
+    return _create_units_object(values, units)
@@ -1,4 +1,4 @@
 from units import create_units
 from units.constants import PREDEFINED_GROUP_LIST
 
-mm, cm, m, km = create_units(group_name=PREDEFINED_GROUP_LIST[0], mm=1, cm=10, m=100, km=1000)
\ No newline at end of file
+mm, cm, m, km = create_units(group_name=PREDEFINED_GROUP_LIST[0], lazy=True, mm=1, cm=10, m=100, km=1000)
@@ -0,0 +1,69 @@
+from array import array
+from numbers import Number
+
+from units import Units, SingleUnits, Signature, IDENTITY_CONVERSION, _active_registry, _conversion_plan, \
+    _create_units_object, _is_array_like
+
+
+class Converter:
+    """
+    Conversion between two unit signatures validated once, e.g. `(m/sec).to(km/hr)`.
+    Calling it on floats, Units, sequences, array.array or numpy arrays only multiplies by the precomputed scaler
+    """
+    __slots__ = ("from_units", "to_units", "scaler")
+
+    def __init__(self, from_units: Signature, to_units: SingleUnits):
+        plan = _conversion_plan(from_units, to_units, _active_registry.get()._state)
+        self.from_units: Signature = from_units
+        self.to_units: Signature = to_units.units if plan is IDENTITY_CONVERSION else plan[1]
+        self.scaler: float = plan[0]
+
+    def __repr__(self):
+        return f"Converter({dict(self.from_units)} -> {dict(self.to_units)}, scaler={self.scaler})"
+
+    def __call__(self, value):
+        """
+        Converted copy of the value: a float for numbers, Units for Units and containers of the same type otherwise
+        """
+        scaler = self.scaler
+        if isinstance(value, Units):
+            assert value.units == self.from_units, f"Converter expects {dict(self.from_units)} values"
+            return _create_units_object(float(value) * scaler, self.to_units)
+        elif isinstance(value, Number):
+            return value * scaler
+        elif isinstance(value, array):
+            # integer arrays are converted into float ones
+            return self.inplace(array(value.typecode if value.typecode in "fd" else "d", value))
+        elif _is_array_like(value):
+            return self._convert_array(value)
+        return [self(v) for v in value]
+
+    def inplace(self, buffer):
+        """
+        Convert a list, array.array or numpy array of magnitudes in place and return it
+        """
+        scaler = self.scaler
+        if scaler == 1:
+            return buffer
+        if isinstance(buffer, array):
+            assert buffer.typecode in "fd", "Only float arrays can be converted in place"
+            try:
+                import numpy as np
+                np.frombuffer(buffer, dtype=buffer.typecode)[:] *= scaler
+            except ImportError:
+                for i in range(len(buffer)):
+                    buffer[i] *= scaler
+        elif _is_array_like(buffer):
+            dtype = getattr(buffer, "dtype", None)
+            assert dtype is None or dtype.kind in "fc", "Only float arrays can be converted in place"
+            buffer *= scaler
+        else:
+            buffer[:] = [v * scaler for v in buffer]
+        return buffer
+
+    def _convert_array(self, value):
+        from units.array import UnitsArray
+        if isinstance(value, UnitsArray):
+            assert value.units == self.from_units, f"Converter expects {dict(self.from_units)} values"
+            return UnitsArray(value.value * self.scaler, self.to_units)
+        return value * self.scaler
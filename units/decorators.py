@@ -0,0 +1,161 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Callable, Dict, Sequence, Union
+
+from units import Units, SingleUnits, CONVERSION_CACHE_SIZE, _BoundedCache, _active_registry, _base_conversion, \
+    _conversion_plan, _create_units_object, _is_array_like
+
+
+def unit_function(inputs: Union[Sequence[SingleUnits], Dict[str, SingleUnits]] = (),
+                  returns: Union[None, SingleUnits, Sequence[SingleUnits]] = None) -> Callable:
+    """
+    Check units at the function boundary and run the body on plain numbers:
+
+    >>> @unit_function(inputs=(m, sec), returns=m/sec)
+    ... def speed(distance, time):
+    ...     return distance / time
+    >>> speed(2*km, 1*min)
+    33.333333333333336 m/sec
+
+    Every argument declared in inputs (positionally or by parameter name, None skips a parameter)
+    should be Units or UnitsArray of the same dimension. It is converted to the declared units
+    and passed as a float or ndarray; the scaler is cached per argument signature.
+    The result (or every item of a tuple result) is wrapped into the declared units of returns.
+    """
+
+    def decorator(func):
+        names = list(inspect.signature(func).parameters)
+        declared = dict(inputs) if isinstance(inputs, dict) else dict(zip(names, inputs))
+        positional = [declared.get(name) for name in names]
+        cache = _BoundedCache(CONVERSION_CACHE_SIZE)
+
+        def magnitude(name, unit, value):
+            array_like = _is_array_like(value)
+            assert isinstance(value, Units) or array_like and hasattr(value, "units"), \
+                f"Argument {name} of {func.__name__} should be {unit.units}, got {value!r}"
+            state = _active_registry.get()._state
+            cached = cache.get((name, value.units))
+            if cached is None or cached[0] is not state:
+                cached = (state, _conversion_plan(value.units, unit, state)[0])
+                cache.put((name, value.units), cached)
+            scaler = cached[1]
+            if array_like:
+                return value.value if scaler == 1 else value.value * scaler
+            return float(value) * scaler
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            args = [a if i >= len(positional) or positional[i] is None else magnitude(names[i], positional[i], a)
+                    for i, a in enumerate(args)]
+            for name, value in kwargs.items():
+                if declared.get(name) is not None:
+                    kwargs[name] = magnitude(name, declared[name], value)
+            return _wrap_result(func(*args, **kwargs), returns)
+
+        return wrapper
+
+    return decorator
+
+
+def _wrap_result(result, returns):
+    if returns is None:
+        return result
+    if isinstance(returns, (tuple, list)):
+        return tuple(_wrap_result(r, unit) for r, unit in zip(result, returns))
+    if _is_array_like(result):
+        from units.array import UnitsArray
+        return UnitsArray(result, returns.units)
+    return _create_units_object(float(result), returns.units)
+
+
+class MemoizeInfo(namedtuple("MemoizeInfo", "hits misses invalidated maxsize currsize")):
+    """
+    Statistics of a memoized function, invalidated counts entries dropped because the registry changed
+    """
+    __slots__ = ()
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def memoize(maxsize: Union[None, int] = 128, ttl: float = None) -> Callable:
+    """
+    Cache results of a function of Units by the quantities themselves, so f(60*min) and f(1*hr) share an entry:
+
+    >>> @memoize(maxsize=1024, ttl=60)
+    ... def cost(duration):
+    ...     ...
+
+    Units arguments are keyed by their magnitude in the base units of their groups and by the base signature,
+    other arguments should be hashable. The least recently used entry is evicted above maxsize (None is unbounded)
+    and entries expire ttl seconds after they were computed. An entry is dropped when a group of its
+    arguments is re-registered with other weights or destroyed.
+    The wrapper has cache_info() and cache_clear() like functools.lru_cache
+    """
+
+    def decorator(func):
+        entries = OrderedDict()  # key -> (result, ((group, conversion table), ...), expiry time)
+        signatures = {}  # signature -> (state, scaler, base signature, ((group, conversion table), ...))
+        stats = {"hits": 0, "misses": 0, "invalidated": 0}
+        lock = threading.RLock()
+
+        def canonical(value, state, groups: list):
+            if not isinstance(value, Units):
+                return value
+            cached = signatures.get(value.units)
+            if cached is None or cached[0] is not state:
+                _, scaler, base_units, _ = _base_conversion(value.units, state)
+                names = {state.unit_to_group[unit] for unit in (*value.units, *base_units)}
+                cached = signatures[value.units] = \
+                    (state, scaler, base_units, tuple((group, state.group_tables[group]) for group in sorted(names)))
+            groups.extend(cached[3])
+            return float(value) * cached[1], cached[2]
+
+        def valid(entry, state) -> bool:
+            if entry[2] is not None and entry[2] < time.monotonic():
+                return False
+            return all(state.group_tables.get(group) is table for group, table in entry[1])
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state = _active_registry.get()._state
+            groups = []
+            key = (tuple(canonical(a, state, groups) for a in args),
+                   tuple(sorted((name, canonical(v, state, groups)) for name, v in kwargs.items())))
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    if valid(entry, state):
+                        entries.move_to_end(key)
+                        stats["hits"] += 1
+                        return entry[0]
+                    del entries[key]
+                    stats["invalidated"] += 1
+                stats["misses"] += 1
+            result = func(*args, **kwargs)
+            with lock:
+                entries[key] = (result, tuple(groups), None if ttl is None else time.monotonic() + ttl)
+                entries.move_to_end(key)
+                if maxsize is not None and len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+
+        def cache_info() -> MemoizeInfo:
+            return MemoizeInfo(stats["hits"], stats["misses"], stats["invalidated"], maxsize, len(entries))
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                signatures.clear()
+                stats.update(hits=0, misses=0, invalidated=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
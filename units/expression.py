@@ -0,0 +1,234 @@
+import operator
+from abc import ABC, abstractmethod
+from numbers import Number
+from typing import Callable, List
+
+from units import Units, Signature, EMPTY_SIGNATURE, CONVERSION_CACHE_SIZE, IDENTITY_CONVERSION, _BoundedCache, \
+    _active_registry, _alignment_plans, _create_units_object, _is_array_like
+
+# expression shape -> (registry state it was compiled with, CompiledExpression)
+_compiled_cache = _BoundedCache(CONVERSION_CACHE_SIZE)
+
+
+class Expression(ABC):
+    """
+    Deferred unit arithmetic. Operators build a tree instead of computing intermediate Units:
+
+    >>> e = lazy(2*m) / lazy(3*m) / m
+    >>> e.evaluate()
+    0.6666666666666666 1/m
+
+    Units and conversions of the whole tree are resolved once per expression shape,
+    the numbers are then combined in a single pass over plain floats or arrays.
+    """
+    # make Units and numpy arrays defer to our reflected operators
+    __array_ufunc__ = None
+    _defers_units_operators = True
+    __hash__ = None
+
+    @abstractmethod
+    def _shape(self) -> tuple:
+        """
+        Hashable structure of the tree with the units of the leaves, the key of the compiled expression
+        """
+
+    @abstractmethod
+    def _leaves(self, res: list) -> list:
+        """
+        Append the values of the inputs to res in evaluation order and return it
+        """
+
+    def leaves(self) -> list:
+        """
+        Values of the expression inputs in the order expected by the compiled expression
+        """
+        return self._leaves([])
+
+    def compile(self) -> "CompiledExpression":
+        state = _active_registry.get()._state
+        shape = self._shape()
+        cached = _compiled_cache.get(shape)
+        if cached is None or cached[0] is not state:
+            cached = (state, CompiledExpression(*_compile(shape, [0], state)))
+            _compiled_cache.put(shape, cached)
+        return cached[1]
+
+    def evaluate(self):
+        return self.compile()(*self.leaves())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._shape()})"
+
+    def __add__(self, other):
+        return Operation("+", self, _as_expression(other))
+
+    def __radd__(self, other):
+        return Operation("+", _as_expression(other), self)
+
+    def __sub__(self, other):
+        return Operation("-", self, _as_expression(other))
+
+    def __rsub__(self, other):
+        return Operation("-", _as_expression(other), self)
+
+    def __mul__(self, other):
+        return Operation("*", self, _as_expression(other))
+
+    def __rmul__(self, other):
+        return Operation("*", _as_expression(other), self)
+
+    def __truediv__(self, other):
+        return Operation("/", self, _as_expression(other))
+
+    def __rtruediv__(self, other):
+        return Operation("/", _as_expression(other), self)
+
+    def __floordiv__(self, other):
+        return Operation("//", self, _as_expression(other))
+
+    def __rfloordiv__(self, other):
+        return Operation("//", _as_expression(other), self)
+
+    def __pow__(self, power, modulo=None):
+        assert isinstance(power, Number) and not isinstance(power, Units), "Raising to the Units object makes no sense"
+        return Power(self, power)
+
+    def __neg__(self):
+        return Operation("*", Leaf(-1), self)
+
+
+class Leaf(Expression):
+    __slots__ = ("value", "units")
+
+    def __init__(self, value):
+        assert isinstance(value, Number) or hasattr(value, "units") or _is_array_like(value), \
+            f"Cannot use {type(value)} in an expression"
+        self.value = value
+        self.units = value.units if hasattr(value, "units") else None
+
+    def _shape(self) -> tuple:
+        return "leaf", self.units
+
+    def _leaves(self, res: list) -> list:
+        res.append(self.value)
+        return res
+
+
+class Operation(Expression):
+    __slots__ = ("operator", "left", "right")
+
+    def __init__(self, op: str, left: Expression, right: Expression):
+        self.operator = op
+        self.left = left
+        self.right = right
+
+    def _shape(self) -> tuple:
+        return self.operator, self.left._shape(), self.right._shape()
+
+    def _leaves(self, res: list) -> list:
+        return self.right._leaves(self.left._leaves(res))
+
+
+class Power(Expression):
+    __slots__ = ("base", "power")
+
+    def __init__(self, base: Expression, power: Number):
+        self.base = base
+        self.power = power
+
+    def _shape(self) -> tuple:
+        return "**", self.base._shape(), self.power
+
+    def _leaves(self, res: list) -> list:
+        return self.base._leaves(res)
+
+
+class CompiledExpression:
+    """
+    Expression resolved for one shape: result units plus a function over the raw input magnitudes.
+    Call it with new inputs (Units, UnitsArray or magnitudes in the units of the original leaves) to replay it
+    """
+    __slots__ = ("units", "leaf_units", "function")
+
+    def __init__(self, units: Signature, function: Callable, leaf_units: List[Signature]):
+        self.units = units if units is not None else EMPTY_SIGNATURE
+        self.function = function
+        self.leaf_units = leaf_units
+
+    def __call__(self, *values):
+        assert len(values) == len(self.leaf_units), f"Expected {len(self.leaf_units)} input values"
+        raw = []
+        for value, units in zip(values, self.leaf_units):
+            if hasattr(value, "units"):
+                assert value.units == units, f"Expected input in {units}, got {value.units}"
+                raw.append(value.value if not isinstance(value, Units) else float(value))
+            else:
+                raw.append(value)
+        res = self.function(raw)
+        if _is_array_like(res):
+            from units.array import UnitsArray
+            return UnitsArray(res, self.units)
+        return _create_units_object(float(res), self.units)
+
+
+def lazy(value) -> Expression:
+    """
+    Start a deferred expression from a Units, UnitsArray or number
+    """
+    return value if isinstance(value, Expression) else Leaf(value)
+
+
+def _as_expression(value) -> Expression:
+    return value if isinstance(value, Expression) else Leaf(value)
+
+
+_OPERATORS = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv, "//": operator.floordiv}
+
+
+def _compile(shape: tuple, index: list, state):
+    """
+    Resolve the shape into (result signature, function over the list of raw leaf values, leaf signatures),
+    applying the same alignment rules as the eager operators. index counts the leaves visited so far
+    """
+    kind = shape[0]
+    if kind == "leaf":
+        i = index[0]
+        index[0] += 1
+        return shape[1], operator.itemgetter(i), [shape[1]]
+    if kind == "**":
+        units, function, leaf_units = _compile(shape[1], index, state)
+        power = shape[2]
+        return (units ** power if units is not None else None), lambda v: function(v) ** power, leaf_units
+
+    left_units, left, left_leaves = _compile(shape[1], index, state)
+    right_units, right, right_leaves = _compile(shape[2], index, state)
+    left_plan, right_plan = _alignment_plans((left_units, right_units), state)
+    left_scaler, left_units = _aligned(left_plan, left_units)
+    right_scaler, right_units = _aligned(right_plan, right_units)
+    leaf_units = left_leaves + right_leaves
+    op = _OPERATORS[kind]
+
+    if kind in "+-":
+        assert left_units is None or right_units is None or left_units == right_units, \
+            "Cannot add values with different units" if kind == "+" else "Cannot subtract values with different units"
+        units = left_units if left_units is not None else right_units
+    else:
+        left_signature = left_units if left_units is not None else EMPTY_SIGNATURE
+        right_signature = right_units if right_units is not None else EMPTY_SIGNATURE
+        units = left_signature * right_signature if kind == "*" else left_signature / right_signature
+        if kind != "//":
+            # scalers of a product or a quotient fold into one constant
+            k = left_scaler * right_scaler if kind == "*" else left_scaler / right_scaler
+            if k == 1:
+                return units, lambda v: op(left(v), right(v)), leaf_units
+            return units, lambda v: op(left(v), right(v)) * k, leaf_units
+
+    if left_scaler == 1 and right_scaler == 1:
+        return units, lambda v: op(left(v), right(v)), leaf_units
+    return units, lambda v: op(left(v) * left_scaler, right(v) * right_scaler), leaf_units
+
+
+def _aligned(plan, units):
+    if plan is None or plan is IDENTITY_CONVERSION:
+        return 1, units
+    return plan
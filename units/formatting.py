@@ -0,0 +1,37 @@
+import sys
+from typing import Iterable, List
+
+from units import Units, _format_units, _format_value
+
+
+def format_units(value: Units, precision: int = None) -> str:
+    """
+    Same as str(value), or with exactly `precision` digits after the decimal point
+    """
+    return f"{_format_number(float(value), precision)} {_format_units(value.units)}"
+
+
+def format_many(values: Iterable[Units], precision: int = None) -> List[str]:
+    """
+    Format a sequence of quantities or a UnitsArray. The suffix is rendered once per distinct signature,
+    so the cost is dominated by formatting the numbers
+    """
+    array_module = sys.modules.get("units.array")
+    if array_module is not None and isinstance(values, array_module.UnitsArray):
+        suffix = " " + _format_units(values.units)
+        return [f"{_format_number(v, precision)}{suffix}" for v in values.value.ravel().tolist()]
+
+    suffixes = {}
+    res = []
+    for v in values:
+        suffix = suffixes.get(v.units)
+        if suffix is None:
+            suffix = suffixes[v.units] = " " + _format_units(v.units)
+        res.append(f"{_format_number(float(v), precision)}{suffix}")
+    return res
+
+
+def _format_number(value: float, precision: int = None) -> str:
+    if precision is None:
+        return str(_format_value(value))
+    return f"{value:.{precision}f}"
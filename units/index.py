@@ -0,0 +1,90 @@
+"""
+Sorted index of quantities in mixed units of one dimension.
+
+Keys are the magnitudes in the base units of the groups, kept in a contiguous array("d")
+next to the original values, so range and nearest queries are plain bisections over floats:
+
+>>> jobs = QuantityIndex([90*sec, 1*hr, 3*min, 3*hr])
+>>> jobs.range(5*min, 2*hr)
+[1 hr]
+
+Keys are computed with the registry weights at insertion time.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List
+
+from units import Units, SingleUnits, Signature, _active_registry, _base_conversion
+
+
+class QuantityIndex:
+    def __init__(self, values: Iterable = (), units: SingleUnits = None):
+        """
+        units: any unit of the indexed dimension, otherwise the dimension of the first value is used
+        """
+        self._keys = array("d")
+        self._values = []
+        self._base_units: Signature = None
+        self._factors = {}
+        if units is not None:
+            self._key(units)
+        self.update(values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, item):
+        return self._values[item]
+
+    def __repr__(self):
+        return f"QuantityIndex({self._values})"
+
+    def add(self, value: Units):
+        key = self._key(value)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._values.insert(i, value)
+
+    def update(self, values: Iterable):
+        """
+        Bulk insert, sorting the index once
+        """
+        pairs = [(self._key(v), v) for v in values]
+        if not pairs:
+            return
+        pairs.extend(zip(self._keys, self._values))
+        pairs.sort(key=lambda pair: pair[0])
+        self._keys = array("d", (key for key, _ in pairs))
+        self._values = [v for _, v in pairs]
+
+    def range(self, low: Units = None, high: Units = None, include_low=True, include_high=True) -> List[Units]:
+        """
+        Values between low and high in sorted order, a missing bound is open
+        """
+        start = 0 if low is None else (bisect_left if include_low else bisect_right)(self._keys, self._key(low))
+        stop = len(self._keys) if high is None else \
+            (bisect_right if include_high else bisect_left)(self._keys, self._key(high))
+        return self._values[start:stop]
+
+    def nearest(self, value: Units) -> Units:
+        assert self._values, "nearest() of an empty index"
+        key = self._key(value)
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or i > 0 and key - self._keys[i - 1] <= self._keys[i] - key:
+            i -= 1
+        return self._values[i]
+
+    def _key(self, value: Units) -> float:
+        assert isinstance(value, Units), f"Cannot index {type(value)}"
+        scaler = self._factors.get(value.units)
+        if scaler is None:
+            _, scaler, base_units, _ = _base_conversion(value.units, _active_registry.get()._state)
+            if self._base_units is None:
+                self._base_units = base_units
+            assert base_units == self._base_units, \
+                f"Cannot index {dict(value.units)} values together with {dict(self._base_units)}"
+            self._factors[value.units] = scaler
+        return float(value) * scaler
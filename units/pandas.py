@@ -0,0 +1,308 @@
+"""
+pandas extension type for unit-tagged columns: the values are a float64 ndarray with one unit signature.
+
+>>> s = pd.Series([1, 2, 3], dtype=UnitsDtype(m/sec))
+>>> s * 2 + 1*km/hr
+>>> s >> km/hr
+>>> s.sum()
+
+Arithmetic, comparisons and conversions run on the whole column at once through UnitsArray.
+"""
+import operator
+import re
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, take
+
+from units import Units, SingleUnits, Signature, EMPTY_SIGNATURE, _active_registry, _base_conversion, \
+    _create_units_object, _format_units
+from units.array import UnitsArray
+
+
+@register_extension_dtype
+class UnitsDtype(ExtensionDtype):
+    """
+    dtype of a column in the given units, "units[m/sec]" as a string
+    """
+    type = Units
+    kind = "f"
+    na_value = np.nan
+    _metadata = ("units",)
+    _match = re.compile(r"^units\[(?P<suffix>.*)\]$")
+
+    def __init__(self, units=EMPTY_SIGNATURE):
+        self.units: Signature = Signature(units.units if isinstance(units, Units) else units)
+
+    @property
+    def name(self) -> str:
+        return f"units[{_format_units(self.units)}]"
+
+    @classmethod
+    def construct_array_type(cls):
+        return UnitsExtensionArray
+
+    @classmethod
+    def construct_from_string(cls, string: str):
+        if not isinstance(string, str):
+            raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+        match = cls._match.match(string)
+        if match is None:
+            raise TypeError(f"Cannot construct a 'UnitsDtype' from '{string}'")
+        from units.parser import parse_signature
+        try:
+            return cls(parse_signature(match.group("suffix")))
+        except ValueError as e:
+            raise TypeError(str(e)) from None
+
+    @property
+    def _is_numeric(self) -> bool:
+        return True
+
+    def _get_common_dtype(self, dtypes):
+        """
+        Columns in units of one dimension are combined, e.g. by pd.concat, in the units of the first one
+        """
+        if not all(isinstance(dtype, UnitsDtype) for dtype in dtypes):
+            return None
+        state = _active_registry.get()._state
+        base_units = {_base_conversion(dtype.units, state)[2] for dtype in dtypes}
+        return dtypes[0] if len(base_units) == 1 else None
+
+
+class UnitsExtensionArray(ExtensionArray):
+    """
+    Column of float64 magnitudes in the units of its UnitsDtype
+    """
+    __array_priority__ = 1000
+
+    def __init__(self, values, units, copy: bool = False):
+        self._data: np.ndarray = np.array(values, dtype="float64", copy=copy or None)
+        assert self._data.ndim == 1, "UnitsExtensionArray should be one-dimensional"
+        self._dtype = UnitsDtype(units)
+
+    @property
+    def units(self) -> Signature:
+        return self._dtype.units
+
+    @property
+    def dtype(self) -> UnitsDtype:
+        return self._dtype
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(dtype, str):
+            dtype = UnitsDtype.construct_from_string(dtype)
+        if isinstance(scalars, (UnitsExtensionArray, UnitsArray)):
+            res = cls(scalars._data if isinstance(scalars, cls) else scalars.value, scalars.units, copy=copy)
+            return res if dtype is None else res >> SingleUnits(dtype.units)
+        units = dtype.units if dtype is not None else None
+        values = []
+        scalers = {}
+        for v in scalars:
+            if isinstance(v, Units):
+                if units is None:
+                    units = v.units
+                scaler = scalers.get(v.units)
+                if scaler is None:
+                    scaler = scalers[v.units] = 1 if v.units == units else v.to(SingleUnits(units)).scaler
+                values.append(float(v) * scaler)
+            elif v is None or v is pd.NA or isinstance(v, Number):
+                values.append(np.nan if v is None or v is pd.NA else float(v))
+            else:
+                raise TypeError(f"Cannot store {type(v)} in a units column")
+        return cls(values, units if units is not None else EMPTY_SIGNATURE)
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, *, dtype=None, copy=False):
+        from units.parser import parse_units
+        return cls._from_sequence([parse_units(s) for s in strings], dtype=dtype)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls(values, original.units)
+
+    def _values_for_factorize(self):
+        return self._data, np.nan
+
+    def _values_for_argsort(self) -> np.ndarray:
+        return self._data
+
+    def _values_for_json(self) -> np.ndarray:
+        return self._data
+
+    def _hash_pandas_object(self, *, encoding: str, hash_key: str, categorize: bool) -> np.ndarray:
+        return pd.util.hash_array(self._data, encoding=encoding, hash_key=hash_key, categorize=categorize)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, item):
+        if isinstance(item, tuple) and len(item) == 1:
+            item = item[0]
+        if np.ndim(item) == 0 and not isinstance(item, slice):
+            value = self._data[item]
+            return np.nan if np.isnan(value) else _create_units_object(float(value), self.units)
+        item = pd.api.indexers.check_array_indexer(self, item)
+        return UnitsExtensionArray(self._data[item], self.units)
+
+    def __setitem__(self, key, value):
+        if isinstance(value, Units):
+            value = float(value >> SingleUnits(self.units))
+        elif value is None or value is pd.NA:
+            value = np.nan
+        elif not isinstance(value, Number):
+            value = self._from_sequence(value, dtype=self.dtype)._data
+        self._data[key] = value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __array__(self, dtype=None, copy=None):
+        # numpy sees the magnitudes, so pandas runs its native float algorithms, e.g. nlargest, on them
+        if dtype is None or np.dtype(dtype).kind != "O":
+            return self._data.astype(dtype if dtype is not None else "float64", copy=copy is not False)
+        return np.array(list(self), dtype=object)
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def isna(self) -> np.ndarray:
+        return np.isnan(self._data)
+
+    def copy(self):
+        return UnitsExtensionArray(self._data, self.units, copy=True)
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        if allow_fill and isinstance(fill_value, Units):
+            fill_value = float(fill_value >> SingleUnits(self.units))
+        elif fill_value is None or fill_value is pd.NA:
+            fill_value = np.nan
+        return UnitsExtensionArray(take(self._data, indices, allow_fill=allow_fill, fill_value=fill_value), self.units)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        units = to_concat[0].units
+        return cls(np.concatenate([(a >> SingleUnits(units))._data for a in to_concat]), units)
+
+    def _formatter(self, boxed: bool = False):
+        return str
+
+    def to_units_array(self) -> UnitsArray:
+        return UnitsArray(self._data, self.units)
+
+    def __rshift__(self, other: SingleUnits) -> "UnitsExtensionArray":
+        if not isinstance(other, SingleUnits):
+            raise TypeError("Incorrect argument for right-shift operator. Should be SingleUnit instance")
+        if other.units == self.units:
+            return self
+        converted = self.to_units_array() >> other
+        return UnitsExtensionArray(converted.value, converted.units)
+
+    def _operate(self, other, op):
+        other = _unbox(other)
+        if other is None:
+            return NotImplemented
+        if not isinstance(other, (Number, UnitsArray, np.ndarray, list, tuple)):
+            # e.g. strings: never equal to quantities, other operators are unsupported
+            if op is operator.eq or op is operator.ne:
+                return np.full(len(self), op is operator.ne)
+            return NotImplemented
+        res = op(self.to_units_array(), other)
+        return UnitsExtensionArray(res.value, res.units) if isinstance(res, UnitsArray) else res
+
+    def __add__(self, other):
+        return self._operate(other, operator.add)
+
+    def __radd__(self, other):
+        return self._operate(other, lambda a, b: b + a)
+
+    def __sub__(self, other):
+        return self._operate(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._operate(other, lambda a, b: b - a)
+
+    def __mul__(self, other):
+        return self._operate(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._operate(other, lambda a, b: b * a)
+
+    def __truediv__(self, other):
+        return self._operate(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self._operate(other, lambda a, b: b / a)
+
+    def __floordiv__(self, other):
+        return self._operate(other, operator.floordiv)
+
+    def __rfloordiv__(self, other):
+        return self._operate(other, lambda a, b: b // a)
+
+    def __pow__(self, power):
+        return self._operate(power, operator.pow)
+
+    def __neg__(self):
+        return UnitsExtensionArray(-self._data, self.units)
+
+    def __pos__(self):
+        return self.copy()
+
+    def __abs__(self):
+        return UnitsExtensionArray(np.abs(self._data), self.units)
+
+    def __eq__(self, other):
+        return self._operate(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._operate(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._operate(other, operator.lt)
+
+    def __le__(self, other):
+        return self._operate(other, operator.le)
+
+    def __gt__(self, other):
+        return self._operate(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._operate(other, operator.ge)
+
+    def _reduce(self, name: str, *, skipna: bool = True, keepdims: bool = False, **kwargs):
+        reductions = {"sum": np.nansum, "mean": np.nanmean, "min": np.nanmin, "max": np.nanmax,
+                      "median": np.nanmedian, "std": np.nanstd} if skipna else \
+            {"sum": np.sum, "mean": np.mean, "min": np.min, "max": np.max, "median": np.median, "std": np.std}
+        if name not in reductions:
+            raise TypeError(f"Cannot perform {name} on a units column")
+        if name == "std":
+            kwargs = {"ddof": kwargs.get("ddof", 1)}
+        else:
+            kwargs = {}
+        res = _create_units_object(float(reductions[name](self._data, **kwargs)), self.units)
+        return type(self)._from_sequence([res]) if keepdims else res
+
+
+def _unbox(other):
+    """
+    Operand of UnitsArray for other, None when pandas should unpack the container itself
+    """
+    if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+        return None
+    if isinstance(other, UnitsExtensionArray):
+        return other.to_units_array()
+    if isinstance(other, ExtensionArray):
+        return np.asarray(other, dtype="float64")
+    return other
+
+
+def convert_series(series: pd.Series, to_units: SingleUnits) -> pd.Series:
+    """
+    Series of a units dtype converted to to_units, what `series >> to_units` returns
+    """
+    return pd.Series(series.array >> to_units, index=series.index, name=series.name)
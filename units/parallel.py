@@ -0,0 +1,110 @@
+"""
+Conversion of large buffers across a pool of processes.
+
+The magnitudes are copied once into shared memory, every worker receives only the name of the segment,
+its slice and the conversion factor validated in the parent, and scales the slice in place.
+"""
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Union
+
+from units import SingleUnits, Signature, _is_array_like
+from units.converter import Converter
+
+# Buffers shorter than this are converted in the calling process, a pool round trip costs more
+PARALLEL_CONVERSION_THRESHOLD = 1_000_000
+
+ConvertedBuffer = namedtuple("ConvertedBuffer", "values units")
+
+_FLOAT_SIZE = array("d").itemsize
+
+
+def parallel_convert(values, to_units: SingleUnits, from_units: Union[None, Signature, SingleUnits] = None,
+                     workers: int = None, executor: Executor = None,
+                     threshold: int = PARALLEL_CONVERSION_THRESHOLD):
+    """
+    Convert a UnitsArray, or a numpy array / array.array of magnitudes in from_units, to to_units.
+    Returns a UnitsArray for numpy input and ConvertedBuffer(array("d"), units) for array.array.
+    Pass an executor to reuse a pool between calls, otherwise one with `workers` processes is started.
+    workers is also the number of slices submitted to the executor, os.cpu_count() by default
+    """
+    if hasattr(values, "units"):
+        assert from_units is None or Signature(getattr(from_units, "units", from_units)) == values.units, \
+            "from_units should match the units of the array"
+        from_units, values = values.units, values.value
+    assert from_units is not None, "from_units are required for a buffer of plain numbers"
+    converter = Converter(Signature(getattr(from_units, "units", from_units)), to_units)
+    count = values.size if _is_array_like(values) else len(values)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if count < threshold or workers < 2 or converter.scaler == 1:
+        return _result(converter.inplace(_float_copy(values)), converter.to_units)
+
+    shm = shared_memory.SharedMemory(create=True, size=count * _FLOAT_SIZE)
+    try:
+        view = shm.buf.cast("d")
+        try:
+            view[:] = memoryview(_contiguous(values)) if _is_array_like(values) else _float_copy(values)
+            bounds = [count * i // workers for i in range(workers + 1)]
+            pool = executor if executor is not None else ProcessPoolExecutor(workers)
+            try:
+                futures = [pool.submit(_scale_range, shm.name, start, stop, converter.scaler)
+                           for start, stop in zip(bounds, bounds[1:]) if start < stop]
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is None:
+                    pool.shutdown()
+            converted = _copy_out(view, values)
+        finally:
+            view.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return _result(converted, converter.to_units)
+
+
+def _scale_range(name: str, start: int, stop: int, scaler: float):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        try:
+            import numpy as np
+            np.ndarray(stop - start, dtype="d", buffer=shm.buf, offset=start * _FLOAT_SIZE)[:] *= scaler
+        except ImportError:
+            view = shm.buf.cast("d")
+            for i in range(start, stop):
+                view[i] *= scaler
+            view.release()
+    finally:
+        shm.close()
+
+
+def _float_copy(values):
+    if _is_array_like(values):
+        return values.astype("d")
+    return array("d", values)
+
+
+def _contiguous(values):
+    import numpy as np
+    return np.ascontiguousarray(values, dtype="d").reshape(-1)
+
+
+def _copy_out(view: memoryview, values):
+    if _is_array_like(values):
+        import numpy as np
+        return np.array(view).reshape(values.shape)
+    res = array("d")
+    res.frombytes(view.cast("B"))
+    return res
+
+
+def _result(values, units: Signature):
+    if _is_array_like(values):
+        from units.array import UnitsArray
+        return UnitsArray(values, units)
+    return ConvertedBuffer(values, SingleUnits(units))
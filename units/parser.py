@@ -0,0 +1,92 @@
+from typing import Iterable, List
+
+from units import Units, SingleUnits, Signature, EMPTY_SIGNATURE, CONVERSION_CACHE_SIZE, IDENTITY_CONVERSION, \
+    _BoundedCache, _active_registry, _conversion_plan, _create_units_object
+
+# unit suffix -> (registry state it was validated against, signature)
+_suffix_cache = _BoundedCache(CONVERSION_CACHE_SIZE)
+
+
+def parse_units(text: str) -> Units:
+    """
+    Parse a quantity in the format produced by Units.__str__, e.g. "7.2 km/hr", "2 (m*sec^2)" or "2 1/sec^2"
+    """
+    value, _, suffix = text.strip().partition(" ")
+    return _create_units_object(_parse_number(value, text), parse_signature(suffix))
+
+
+def parse_signature(suffix: str) -> Signature:
+    """
+    Parse a unit suffix such as "m/sec^2" against the active registry. Parsed suffixes are cached
+    """
+    state = _active_registry.get()._state
+    cached = _suffix_cache.get(suffix)
+    if cached is not None and cached[0] is state:
+        return cached[1]
+    signature = _parse_suffix(suffix)
+    for unit in signature:
+        if unit not in state.unit_to_group:
+            raise ValueError(f"Unknown unit {unit!r} in {suffix!r}")
+    _suffix_cache.put(suffix, (state, signature))
+    return signature
+
+
+def parse_many(texts: Iterable[str]) -> List[Units]:
+    return [parse_units(text) for text in texts]
+
+
+def parse_array(texts: Iterable[str]):
+    """
+    Parse a column of quantities into a single UnitsArray in the units of the first value.
+    Other units of the same dimension are converted with one plan per distinct suffix
+    """
+    from units.array import UnitsArray
+    state = _active_registry.get()._state
+    units = None
+    scalers = {}
+    values = []
+    for text in texts:
+        value, _, suffix = text.strip().partition(" ")
+        scaler = scalers.get(suffix)
+        if scaler is None:
+            signature = parse_signature(suffix)
+            if units is None:
+                units = signature
+            plan = IDENTITY_CONVERSION if signature == units else _conversion_plan(signature, SingleUnits(units), state)
+            scaler = scalers[suffix] = plan[0]
+        values.append(_parse_number(value, text) * scaler)
+    return UnitsArray(values, units if units is not None else EMPTY_SIGNATURE)
+
+
+def _parse_number(value: str, text: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Cannot parse quantity {text!r}") from None
+
+
+def _parse_suffix(suffix: str) -> Signature:
+    units = {}
+    numerator, _, denominator = suffix.strip().partition("/")
+    for part, sign in ((numerator, 1), (denominator, -1)):
+        part = part.strip()
+        if part.startswith("(") and part.endswith(")"):
+            part = part[1:-1]
+        if part in ("", "1"):
+            continue
+        for factor in part.split("*"):
+            name, _, power = factor.strip().partition("^")
+            if not name.isidentifier():
+                raise ValueError(f"Cannot parse unit suffix {suffix!r}")
+            units[name] = units.get(name, 0) + sign * (_parse_power(power, suffix) if power else 1)
+    return Signature(units)
+
+
+def _parse_power(power: str, suffix: str):
+    try:
+        return int(power)
+    except ValueError:
+        try:
+            return float(power)
+        except ValueError:
+            raise ValueError(f"Cannot parse unit suffix {suffix!r}") from None
@@ -0,0 +1,229 @@
+"""
+Opt-in instrumentation of the hot paths: call counters and timing histograms of the Units operators,
+conversions, alignment, operator dispatch plans, allocations and registry calls.
+
+Nothing is wrapped while no registry is profiled, so disabled profiling costs nothing.
+Enabling it installs timing wrappers which record into the Profile of the active registry:
+
+>>> with profile() as p:
+...     (2*m/sec + 3*km/hr) >> km/hr
+>>> print(p.report())
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from threading import RLock
+from time import perf_counter_ns
+from typing import Callable, Dict, Optional
+
+import units
+from units import Units, SingleUnits, UnitRegistry, get_registry, _active_registry
+
+OPERATORS = ("__add__", "__radd__", "__sub__", "__rsub__", "__mul__", "__rmul__", "__truediv__", "__rtruediv__",
+             "__floordiv__", "__rfloordiv__", "__pow__", "__rpow__", "__rshift__", "__eq__", "__ne__",
+             "__lt__", "__le__", "__gt__", "__ge__", "__hash__")
+REGISTRY_METHODS = ("create_units", "create_groups", "load_units", "destroy_units", "save_snapshot", "load_snapshot")
+
+# registry -> Profile collecting its events
+_profiles: Dict[UnitRegistry, "Profile"] = {}
+# (owner, attribute) -> original attribute, filled while the wrappers are installed
+_originals = {}
+_lock = RLock()
+
+
+class Profile:
+    """
+    Events recorded for one registry. Every timed event lands in a histogram bucket
+    of powers of two nanoseconds, plain counters (e.g. "conversion.identity") have no timing.
+    callback(name, elapsed_ns) is called for every event, elapsed_ns is None for counters
+    """
+
+    def __init__(self, callback: Callable[[str, Optional[int]], None] = None):
+        self.callback = callback
+        self.counts = Counter()
+        self.total_ns = Counter()
+        self.histograms = defaultdict(Counter)
+
+    def record(self, name: str, elapsed_ns: int):
+        self.counts[name] += 1
+        self.total_ns[name] += elapsed_ns
+        self.histograms[name][elapsed_ns.bit_length()] += 1
+        if self.callback is not None:
+            self.callback(name, elapsed_ns)
+
+    def count(self, name: str):
+        self.counts[name] += 1
+        if self.callback is not None:
+            self.callback(name, None)
+
+    def reset(self):
+        self.counts.clear()
+        self.total_ns.clear()
+        self.histograms.clear()
+
+    def stats(self) -> dict:
+        """
+        {event: {"calls", "total_ns", "mean_ns", "histogram": {upper bound in ns: calls}}}, counters only have "calls"
+        """
+        res = {}
+        for name, calls in sorted(self.counts.items()):
+            if name in self.histograms:
+                total = self.total_ns[name]
+                res[name] = {"calls": calls, "total_ns": total, "mean_ns": total / calls,
+                             "histogram": {1 << bucket: n for bucket, n in sorted(self.histograms[name].items())}}
+            else:
+                res[name] = {"calls": calls}
+        return res
+
+    def report(self) -> str:
+        lines = [f"{'event':32} {'calls':>10} {'total ms':>10} {'mean ns':>10} {'p50 ns':>10} {'p99 ns':>10}"]
+        for name, stat in self.stats().items():
+            if "histogram" in stat:
+                lines.append(f"{name:32} {stat['calls']:10} {stat['total_ns'] / 1e6:10.3f} {stat['mean_ns']:10.0f} "
+                             f"{_percentile(stat, 0.5):>10} {_percentile(stat, 0.99):>10}")
+            else:
+                lines.append(f"{name:32} {stat['calls']:10}")
+        return "\n".join(lines)
+
+
+def enable(registry: UnitRegistry = None, callback: Callable[[str, Optional[int]], None] = None) -> Profile:
+    """
+    Start profiling the registry (the active one by default) and return its Profile
+    """
+    registry = registry if registry is not None else get_registry()
+    with _lock:
+        if registry not in _profiles:
+            _profiles[registry] = Profile(callback)
+            if len(_profiles) == 1:
+                _install()
+        return _profiles[registry]
+
+
+def disable(registry: UnitRegistry = None) -> Optional[Profile]:
+    """
+    Stop profiling the registry and return what was collected. The wrappers are removed with the last profile
+    """
+    registry = registry if registry is not None else get_registry()
+    with _lock:
+        res = _profiles.pop(registry, None)
+        if res is not None and not _profiles:
+            _uninstall()
+        return res
+
+
+@contextmanager
+def profile(registry: UnitRegistry = None, callback: Callable[[str, Optional[int]], None] = None):
+    registry = registry if registry is not None else get_registry()
+    res = enable(registry, callback)
+    try:
+        yield res
+    finally:
+        disable(registry)
+
+
+def _install():
+    for name in OPERATORS:
+        _patch(Units, name, _timed(f"operator.{name}", Units.__dict__[name]))
+    _patch(SingleUnits, "__rrshift__", _timed("conversion.__rrshift__", SingleUnits.__dict__["__rrshift__"]))
+    _patch(Units, "__new__", staticmethod(_allocation(Units.__dict__["__new__"].__func__)))
+    _patch(units, "_convert_unit", _conversion(units._convert_unit))
+    _patch(units, "_align_units", _alignment(units._align_units))
+    _patch(units, "_dispatch_plan", _timed("dispatch.plan", units._dispatch_plan))
+    # operators with a cached dispatch plan skip _align_units, they report their conversions through the hook
+    _patch(units, "_profile_hook", _count)
+    for name in REGISTRY_METHODS:
+        _patch(UnitRegistry, name, _registry_call(f"registry.{name}", UnitRegistry.__dict__[name]))
+
+
+def _uninstall():
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+def _patch(owner, name: str, wrapper):
+    _originals[(owner, name)] = vars(owner)[name]
+    setattr(owner, name, wrapper)
+
+
+def _timed(name: str, func):
+    def wrapper(*args):
+        profile = _profiles.get(_active_registry.get())
+        if profile is None:
+            return func(*args)
+        start = perf_counter_ns()
+        try:
+            return func(*args)
+        finally:
+            profile.record(name, perf_counter_ns() - start)
+
+    return wrapper
+
+
+def _registry_call(name: str, func):
+    def wrapper(registry, *args, **kwargs):
+        profile = _profiles.get(registry)
+        if profile is None:
+            return func(registry, *args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return func(registry, *args, **kwargs)
+        finally:
+            profile.record(name, perf_counter_ns() - start)
+
+    return wrapper
+
+
+def _count(name: str):
+    profile = _profiles.get(_active_registry.get())
+    if profile is not None:
+        profile.count(name)
+
+
+def _allocation(func):
+    def wrapper(cls, *args):
+        profile = _profiles.get(_active_registry.get())
+        if profile is not None:
+            profile.count(f"allocation.{cls.__name__}")
+        return func(cls, *args)
+
+    return wrapper
+
+
+def _conversion(func):
+    timed = _timed("conversion.convert", func)
+
+    def wrapper(v, to_units):
+        res = timed(v, to_units)
+        if res is v:
+            profile = _profiles.get(_active_registry.get())
+            if profile is not None:
+                profile.count("conversion.identity")
+        return res
+
+    return wrapper
+
+
+def _alignment(func):
+    timed = _timed("alignment.align", func)
+
+    def wrapper(*args):
+        res = timed(*args)
+        if any(r is not a for r, a in zip(res, args)):
+            profile = _profiles.get(_active_registry.get())
+            if profile is not None:
+                profile.count("alignment.converted")
+        return res
+
+    return wrapper
+
+
+def _percentile(stat: dict, fraction: float) -> str:
+    """
+    Upper bound of the histogram bucket holding the given fraction of the calls
+    """
+    seen = 0
+    for bound, calls in stat["histogram"].items():
+        seen += calls
+        if seen >= fraction * stat["calls"]:
+            return f"<{bound}"
+    return ""
@@ -0,0 +1,91 @@
+"""
+Single-pass reductions over sequences or generators of Units in mixed units of one dimension:
+
+>>> total([1*hr, 30*min, 45*sec])
+5445 sec
+
+Every element is brought to the base units of its groups with a factor cached per signature
+and the magnitudes are accumulated as plain floats. The result is returned in to_units,
+or in the smallest of the units met in the input.
+"""
+from numbers import Number
+from typing import Iterable
+
+from units import Units, SingleUnits, EMPTY_SIGNATURE, _active_registry, _base_conversion, _create_units_object
+
+
+def total(values: Iterable, to_units: SingleUnits = None):
+    normalizer = _Normalizer(to_units)
+    res = sum(normalizer.magnitudes(values), 0.0)
+    if normalizer.units is None:
+        return _create_units_object(0.0, to_units.units) if to_units is not None else 0
+    return normalizer.result(res)
+
+
+def mean(values: Iterable, to_units: SingleUnits = None):
+    normalizer = _Normalizer(to_units)
+    res = 0.0
+    n = 0
+    for x in normalizer.magnitudes(values):
+        res += x
+        n += 1
+    if n == 0:
+        raise ValueError("mean() of an empty sequence")
+    return normalizer.result(res / n)
+
+
+def minimum(values: Iterable, to_units: SingleUnits = None):
+    normalizer = _Normalizer(to_units)
+    res = min(normalizer.magnitudes(values), default=None)
+    if res is None:
+        raise ValueError("minimum() of an empty sequence")
+    return normalizer.result(res)
+
+
+def maximum(values: Iterable, to_units: SingleUnits = None):
+    normalizer = _Normalizer(to_units)
+    res = max(normalizer.magnitudes(values), default=None)
+    if res is None:
+        raise ValueError("maximum() of an empty sequence")
+    return normalizer.result(res)
+
+
+class _Normalizer:
+    """
+    Base magnitudes of the values of one reduction, remembering the smallest unit met
+    """
+
+    def __init__(self, to_units: SingleUnits = None):
+        assert to_units is None or isinstance(to_units, SingleUnits), "to_units should be SingleUnits instance"
+        self.state = _active_registry.get()._state
+        self.to_units = to_units
+        self.base_units = None
+        self.units = None
+        self.scaler = None
+
+    def magnitudes(self, values: Iterable):
+        factors = {}
+        for v in values:
+            units = v.units if isinstance(v, Units) else EMPTY_SIGNATURE
+            scaler = factors.get(units)
+            if scaler is None:
+                assert isinstance(v, Number), f"Cannot reduce {type(v)}"
+                scaler = factors[units] = self._add_units(units)
+            yield float(v) * scaler
+
+    def _add_units(self, units) -> float:
+        _, scaler, base_units, _ = _base_conversion(units, self.state)
+        if self.base_units is None:
+            self.base_units = base_units
+        assert base_units == self.base_units, "Cannot reduce values with different units"
+        if self.units is None or scaler < self.scaler:
+            self.units, self.scaler = units, scaler
+        return scaler
+
+    def result(self, magnitude: float):
+        units, scaler = self.units, self.scaler
+        if self.to_units is not None:
+            units = self.to_units.units
+            _, scaler, base_units, _ = _base_conversion(units, self.state)
+            assert base_units == self.base_units, f"Cannot convert {self.base_units} to {units}"
+        return _create_units_object(magnitude / scaler, units)
@@ -0,0 +1,201 @@
+"""
+Binary columnar format for homogeneous series of quantities.
+
+Layout: MAGIC, little-endian uint32 header length, JSON header, padding to 8 bytes,
+then the magnitudes as raw little-endian float64. The header keeps the unit signature,
+the group of every unit and the weights of those groups, so a file written with other weights
+is converted to the current registry on load.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from itertools import chain
+from numbers import Number
+from typing import Iterable, Union
+
+from units import Units, SingleUnits, Signature, _active_registry, _create_units_object
+
+MAGIC = b"UNITATES"
+VERSION = 1
+
+_HEADER_LENGTH = struct.Struct("<I")
+_FLOAT = struct.Struct("<d")
+_CHUNK_SIZE = 65536
+
+
+def save_series(path: str, values: Iterable, units: Union[None, dict, SingleUnits] = None):
+    """
+    Write a UnitsArray, a QuantitySeries, an iterable of Units sharing one signature
+    or an iterable of numbers in the given units. Iterables are written in chunks
+    """
+    if isinstance(values, QuantitySeries) or _is_units_array(values):
+        assert units is None or Signature(getattr(units, "units", units)) == values.units, \
+            "units should match the units of the array"
+        units = values.units
+    else:
+        values = iter(values)
+        if units is None:
+            first = next(values, None)
+            assert isinstance(first, Units), "units are required for a series of plain numbers"
+            units = first.units
+            values = chain([first], values)
+    signature = Signature(units.units if isinstance(units, Units) else units)
+
+    with open(path, "wb") as f:
+        f.write(_encode_header(signature))
+        if _is_units_array(values):
+            f.write(values.value.astype("<f8").tobytes())
+            return
+        if isinstance(values, QuantitySeries) and values.scaler == 1:
+            raw = values.raw()
+            try:
+                f.write(raw)
+            finally:
+                raw.release()
+            return
+        chunk = array("d")
+        for v in values:
+            if isinstance(v, Units):
+                assert v.units == signature, f"Series should consist of {dict(signature)} values, got {v}"
+            else:
+                assert isinstance(v, Number), f"Cannot store {type(v)} in a series"
+            chunk.append(float(v))
+            if len(chunk) == _CHUNK_SIZE:
+                _write_chunk(f, chunk)
+                chunk = array("d")
+        _write_chunk(f, chunk)
+
+
+def load_series(path: str) -> "QuantitySeries":
+    return QuantitySeries(path)
+
+
+class QuantitySeries:
+    """
+    Memory-mapped series written by save_series. Values are read lazily from the mapping.
+    When the weights stored in the file differ from the current registry, magnitudes are rescaled on access
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header, self._offset = _decode_header(self._mmap)
+            self.units: Signature = Signature(tuple(u) for u in header["units"])
+            self.scaler: float = _registry_scaler(header, self.units)
+        except Exception:
+            self._mmap.close()
+            raise
+        self._count = (len(self._mmap) - self._offset) // _FLOAT.size
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Unmap the file. Arrays from to_array() and raw() views still in use keep the mapping alive,
+        it is then released when the last of them is garbage-collected
+        """
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def magnitude(self, index: int) -> float:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("series index out of range")
+        return _FLOAT.unpack_from(self._mmap, self._offset + index * _FLOAT.size)[0] * self.scaler
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self._count))]
+        return _create_units_object(self.magnitude(item), self.units)
+
+    def __iter__(self):
+        units, scaler = self.units, self.scaler
+        for (value,) in _FLOAT.iter_unpack(self.raw()):
+            yield _create_units_object(value * scaler, units)
+
+    def raw(self) -> memoryview:
+        """
+        Zero-copy view of the stored bytes. Magnitudes are in the stored weights, see scaler
+        """
+        return memoryview(self._mmap)[self._offset:self._offset + self._count * _FLOAT.size]
+
+    def to_array(self):
+        """
+        UnitsArray backed by the mapping itself when no rescaling is needed
+        """
+        import numpy as np
+        from units.array import UnitsArray
+        values = np.frombuffer(self._mmap, dtype="<f8", count=self._count, offset=self._offset)
+        return UnitsArray(values if self.scaler == 1 else values * self.scaler, self.units)
+
+
+def _is_units_array(values) -> bool:
+    # a UnitsArray exists only once units.array is imported, which requires numpy
+    module = sys.modules.get("units.array")
+    return module is not None and isinstance(values, module.UnitsArray)
+
+
+def _encode_header(signature: Signature) -> bytes:
+    state = _active_registry.get()._state
+    groups = {unit: state.unit_to_group[unit] for unit in signature}
+    header = json.dumps({
+        "version": VERSION,
+        "units": list(signature.items()),
+        "groups": groups,
+        "weights": {group: {unit: state.unit_to_weight[unit] for unit in state.group_to_units[group]}
+                    for group in set(groups.values())},
+    }).encode()
+    length = len(MAGIC) + _HEADER_LENGTH.size + len(header)
+    return MAGIC + _HEADER_LENGTH.pack(len(header)) + header + b" " * (-length % _FLOAT.size)
+
+
+def _decode_header(buffer) -> tuple:
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a units series file")
+    (length,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+    start = len(MAGIC) + _HEADER_LENGTH.size
+    header = json.loads(bytes(buffer[start:start + length]))
+    if header["version"] > VERSION:
+        raise ValueError(f"Unsupported series version {header['version']}")
+    end = start + length
+    return header, end + (-end % _FLOAT.size)
+
+
+def _registry_scaler(header: dict, units: Signature) -> float:
+    """
+    Factor converting stored magnitudes to the weights of the current registry.
+    Weights are compared relative to the smallest stored unit of the group when it is still registered
+    """
+    state = _active_registry.get()._state
+    scaler = 1
+    for unit, power in units.items():
+        group = header["groups"][unit]
+        if state.unit_to_group.get(unit) != group:
+            raise ValueError(f"Unit {unit!r} of group {group!r} is not registered")
+        stored = header["weights"][group]
+        anchor = min(stored, key=stored.get)
+        if state.unit_to_group.get(anchor) == group:
+            ratio = (stored[unit] / stored[anchor]) / (state.unit_to_weight[unit] / state.unit_to_weight[anchor])
+        else:
+            ratio = stored[unit] / state.unit_to_weight[unit]
+        scaler *= ratio ** power
+    return scaler
+
+
+def _write_chunk(f, chunk: array):
+    if sys.byteorder != "little":
+        chunk.byteswap()
+    f.write(chunk.tobytes())
@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+from concurrent.futures import Executor
+from numbers import Number
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from units import Units, SingleUnits, IDENTITY_CONVERSION, _active_registry, _apply_conversion, _conversion_plan, \
+    _create_units_object
+
+# Batches at least this long are converted in the executor passed to aiter_convert
+OFFLOAD_BATCH_SIZE = 65536
+
+
+def iter_convert(iterable: Iterable, to_units: SingleUnits, chunk_size: int = None, as_array: bool = False) -> Iterator:
+    """
+    Lazily convert every element of the iterable to to_units.
+    Plain numbers are tagged with to_units, Units are converted with a plan computed once per source signature.
+    Nested iterables are yielded as nested generators.
+    With chunk_size elements are yielded in lists of at most chunk_size values,
+    or in UnitsArray objects when as_array is set (flat numeric streams only).
+    """
+    assert isinstance(to_units, SingleUnits), "Stream target should be SingleUnits instance"
+    assert chunk_size is None or chunk_size > 0, "chunk_size should be positive"
+    assert not as_array or chunk_size is not None, "as_array requires chunk_size"
+    state = _active_registry.get()._state
+    plans = {}
+
+    def plan_for(units):
+        plan = plans.get(units)
+        if plan is None:
+            plan = plans[units] = _conversion_plan(units, to_units, state)
+        return plan
+
+    def convert(obj):
+        if isinstance(obj, Units):
+            return _apply_conversion(obj, plan_for(obj.units))
+        elif isinstance(obj, Number):
+            return _create_units_object(float(obj), to_units.units)
+        elif isinstance(obj, Iterable) and not isinstance(obj, str):
+            return stream(obj)
+        raise TypeError(f"Cannot convert {type(obj)} to {to_units.units}")
+
+    def magnitude(obj) -> float:
+        if isinstance(obj, Units):
+            return float(obj) * plan_for(obj.units)[0]
+        elif isinstance(obj, Number):
+            return float(obj)
+        raise TypeError(f"Cannot convert {type(obj)} to an array of {to_units.units}")
+
+    def stream(items):
+        for obj in items:
+            yield convert(obj)
+
+    def chunks(items):
+        chunk = []
+        for obj in items:
+            chunk.append(magnitude(obj) if as_array else convert(obj))
+            if len(chunk) == chunk_size:
+                yield _make_chunk(chunk, to_units, as_array)
+                chunk = []
+        if chunk:
+            yield _make_chunk(chunk, to_units, as_array)
+
+    return stream(iterable) if chunk_size is None else chunks(iterable)
+
+
+def _make_chunk(chunk: list, to_units: SingleUnits, as_array: bool):
+    if as_array:
+        from units.array import UnitsArray
+        return UnitsArray(chunk, to_units.units)
+    return chunk
+
+
+async def aiter_convert(source: AsyncIterable, to_units: SingleUnits, from_units: SingleUnits = None,
+                        batch_size: int = 1024, max_delay: float = None, as_array: bool = False,
+                        executor: Executor = None, offload_size: int = OFFLOAD_BATCH_SIZE) -> AsyncIterator:
+    """
+    Convert an async stream of Units, quantity strings ("7.2 km/hr") or plain numbers in from_units
+    (to_units if not given) to to_units, yielding lists of Units or UnitsArray batches when as_array is set.
+
+    A batch is yielded when it has batch_size values, or max_delay seconds after its first value arrived.
+    The source is read ahead by at most batch_size values, so a slow consumer slows the source down.
+    The factor is computed once per source unit; batches of at least offload_size values are converted
+    in the executor, if one is given, to keep the event loop responsive
+    """
+    assert isinstance(to_units, SingleUnits), "Stream target should be SingleUnits instance"
+    assert batch_size > 0, "batch_size should be positive"
+    from units.parser import parse_signature, _parse_number
+    state = _active_registry.get()._state
+    scalers = {None: _conversion_plan(from_units.units, to_units, state)[0] if from_units is not None else 1}
+
+    def magnitude(obj) -> float:
+        if isinstance(obj, Units):
+            key, value = obj.units, float(obj)
+        elif isinstance(obj, Number):
+            key, value = None, float(obj)
+        elif isinstance(obj, str):
+            value, _, key = obj.strip().partition(" ")
+            value = _parse_number(value, obj)
+        else:
+            raise TypeError(f"Cannot convert {type(obj)} to {to_units.units}")
+        scaler = scalers.get(key)
+        if scaler is None:
+            units = parse_signature(key) if isinstance(key, str) else key
+            plan = IDENTITY_CONVERSION if units == to_units.units else _conversion_plan(units, to_units, state)
+            scaler = scalers[key] = plan[0]
+        return value * scaler
+
+    def convert(batch: list):
+        magnitudes = [magnitude(obj) for obj in batch]
+        if as_array:
+            from units.array import UnitsArray
+            return UnitsArray(magnitudes, to_units.units)
+        return [_create_units_object(value, to_units.units) for value in magnitudes]
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=batch_size)
+    producer = loop.create_task(_read_ahead(source, queue))
+    end = None
+    try:
+        while end is None:
+            item = await queue.get()
+            if isinstance(item, _End):
+                end = item
+                break
+            batch = [item]
+            deadline = None if max_delay is None else loop.time() + max_delay
+            while len(batch) < batch_size:
+                if deadline is None:
+                    item = await queue.get()
+                else:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                    except asyncio.TimeoutError:
+                        break
+                if isinstance(item, _End):
+                    end = item
+                    break
+                batch.append(item)
+            if executor is not None and len(batch) >= offload_size:
+                # the copied context keeps the active registry for parsing in the worker
+                yield await loop.run_in_executor(executor, contextvars.copy_context().run, convert, batch)
+            else:
+                yield convert(batch)
+        if end.error is not None:
+            raise end.error
+    finally:
+        producer.cancel()
+
+
+class _End:
+    """
+    Marks the end of the source, error is the exception which stopped it
+    """
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+
+
+async def _read_ahead(source: AsyncIterable, queue: asyncio.Queue):
+    try:
+        async for item in source:
+            await queue.put(item)
+    except Exception as e:
+        await queue.put(_End(e))
+    else:
+        await queue.put(_End())